@@ -2,7 +2,16 @@
 """Analyze the conversations JSON structure"""
 
 import json
+import os
 import sys
+from collections import Counter
+
+try:
+    import ijson
+    JSONError = ijson.JSONError
+except ImportError:
+    ijson = None  # falls back to json.load, holding the whole file in memory
+    JSONError = json.JSONDecodeError
 
 # Read the file path from command line
 if len(sys.argv) < 2:
@@ -12,37 +21,58 @@ if len(sys.argv) < 2:
 filepath = sys.argv[1]
 
 print(f"Reading {filepath}...")
+print(f"File size: {os.path.getsize(filepath):,} bytes")
+
+# Stream the file so only one conversation is held in memory at a time
+# (when ijson is available)
+top_level_keys = []
+
+
+def track_top_level_keys(events):
+    """Pass parser events through, recording keys of the root object"""
+    for prefix, event, value in events:
+        if prefix == '' and event == 'map_key':
+            top_level_keys.append(value)
+        yield prefix, event, value
 
-with open(filepath, 'r', encoding='utf-8') as f:
-    content = f.read()
 
-print(f"File size: {len(content):,} characters")
+def iter_conversations(f):
+    """Yield each item of the top-level 'conversations' array"""
+    if ijson is not None:
+        yield from ijson.items(track_top_level_keys(ijson.parse(f)), 'conversations.item')
+        return
+
+    data = json.load(f)
+    if isinstance(data, dict):
+        top_level_keys.extend(data.keys())
+        yield from data.get('conversations', [])
+
 
-# Try to parse as JSON
 try:
-    data = json.loads(content)
-    print("\n✓ Successfully parsed as JSON")
-    print(f"Top-level keys: {list(data.keys())}")
+    with open(filepath, 'rb') as f:
+        total = 0
+        first = None
+        models = Counter()
+        for conv in iter_conversations(f):
+            total += 1
+            if first is None:
+                first = conv
 
-    if 'conversations' in data:
-        convs = data['conversations']
-        print(f"\nTotal conversations: {len(convs)}")
+            # Group by model
+            models[conv.get('model_id', 'unknown')] += 1
+
+    print("\n✓ Successfully parsed as JSON")
+    print(f"Top-level keys: {top_level_keys}")
 
-        # Group by model
-        models = {}
-        for conv in convs:
-            model_id = conv.get('model_id', 'unknown')
-            if model_id not in models:
-                models[model_id] = 0
-            models[model_id] += 1
+    if 'conversations' in top_level_keys:
+        print(f"\nTotal conversations: {total}")
 
         print("\nConversations by model:")
-        for model, count in sorted(models.items(), key=lambda x: -x[1]):
+        for model, count in models.most_common():
             print(f"  {model}: {count}")
 
         # Show structure of first conversation
-        if len(convs) > 0:
-            first = convs[0]
+        if first is not None:
             print(f"\nFirst conversation structure:")
             print(f"  Keys: {list(first.keys())}")
             print(f"  ID: {first.get('id', 'N/A')}")
@@ -56,7 +86,8 @@ try:
             if 'cot_trace' in first:
                 print(f"  cot_trace length: {len(first['cot_trace']):,} chars")
 
-except json.JSONDecodeError as e:
+except JSONError as e:
     print(f"\n✗ JSON parse error: {e}")
     print("\nFirst 500 chars:")
-    print(content[:500])
+    with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
+        print(f.read(500))
@@ -3,11 +3,13 @@
 Local Data Analysis - Analyze captured trading data directly from SQLite
 No OpenMemory needed - works with local database
 """
+import json
 import sqlite3
 import sys
 from pathlib import Path
 from datetime import datetime
-from collections import Counter, defaultdict
+from collections import Counter
+from functools import lru_cache
 import re
 
 try:
@@ -19,9 +21,78 @@ except ImportError:
     print("Error: 'rich' not installed. Run: uv add rich")
     sys.exit(1)
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None  # substring counts fall back to per-keyword `in` checks
+
+try:
+    import re2 as regex_engine  # google-re2: linear-time DFA, no backtracking
+except ImportError:
+    regex_engine = re
+
 console = Console()
 DB_PATH = Path(__file__).parent.parent / "collector" / "nof1_data.db"
 
+# External-content FTS5 index over model_chat, kept in sync by triggers so
+# rows written by the collector are searchable without a rebuild
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS model_chat_fts USING fts5(
+    reasoning, raw_content,
+    content='model_chat', content_rowid='id',
+    tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS model_chat_ai AFTER INSERT ON model_chat BEGIN
+    INSERT INTO model_chat_fts(rowid, reasoning, raw_content)
+    VALUES (new.id, new.reasoning, new.raw_content);
+END;
+CREATE TRIGGER IF NOT EXISTS model_chat_ad AFTER DELETE ON model_chat BEGIN
+    INSERT INTO model_chat_fts(model_chat_fts, rowid, reasoning, raw_content)
+    VALUES ('delete', old.id, old.reasoning, old.raw_content);
+END;
+CREATE TRIGGER IF NOT EXISTS model_chat_au AFTER UPDATE ON model_chat BEGIN
+    INSERT INTO model_chat_fts(model_chat_fts, rowid, reasoning, raw_content)
+    VALUES ('delete', old.id, old.reasoning, old.raw_content);
+    INSERT INTO model_chat_fts(rowid, reasoning, raw_content)
+    VALUES (new.id, new.reasoning, new.raw_content);
+END;
+"""
+
+# B-tree indexes for the per-model timestamp ordering and action rollups.
+# idx_model_time matches the collector's schema; SQLite walks it backwards
+# for ORDER BY timestamp DESC, so no separate descending index is needed.
+INDEX_SCHEMA = """
+CREATE INDEX IF NOT EXISTS idx_model_time ON model_chat(model_name, timestamp);
+CREATE INDEX IF NOT EXISTS idx_model_chat_action ON model_chat(model_name, action)
+    WHERE action IS NOT NULL AND action != '';
+"""
+
+# Search previews are shown truncated to this many characters
+PREVIEW_CHARS = 100
+
+# Layout of one message in export_model_reasoning output
+EXPORT_SEPARATOR = "=" * 80
+EXPORT_MESSAGE_TEMPLATE = (
+    "Message ID: {id}\nTimestamp: {timestamp}\nModel: {model_name}\n\n"
+    "REASONING:\n" + "-" * 80 + "\n{reasoning}\n" + EXPORT_SEPARATOR + "\n\n"
+)
+
+
+def fts_phrase(keyword: str) -> str:
+    """Quote a keyword as an FTS5 phrase so multi-word terms match in order"""
+    return '"' + keyword.replace('"', '""') + '"'
+
+
+@lru_cache(maxsize=64)
+def compile_pattern(pattern: str):
+    """Compile a case-insensitive search pattern once per distinct string"""
+    return regex_engine.compile("(?i)" + pattern)
+
+
+def sql_regexp(pattern: str, value: str) -> bool:
+    """Backs SQLite's `value REGEXP pattern` operator"""
+    return value is not None and compile_pattern(pattern).search(value) is not None
+
 
 class LocalDataAnalyzer:
     """Analyze trading data directly from local SQLite database"""
@@ -31,14 +102,71 @@ class LocalDataAnalyzer:
         if not db_path.exists():
             raise FileNotFoundError(f"Database not found: {db_path}")
 
+        # One connection for the analyzer's lifetime instead of one per query
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript("""
+            PRAGMA journal_mode = WAL;
+            PRAGMA synchronous = NORMAL;
+            PRAGMA mmap_size = 268435456;
+            PRAGMA cache_size = -65536;
+            PRAGMA temp_store = MEMORY;
+        """)
+        self.conn.create_function("REGEXP", 2, sql_regexp, deterministic=True)
+
+        self._ensure_fts()
+        self._ensure_indexes()
+
+        # (data version, result) pairs for the aggregate views
+        self._overview_cache = (None, None)
+        self._decisions_cache = (None, None)
+
+    def close(self):
+        """Close the database connection"""
+        self.conn.close()
+
+    def _ensure_indexes(self):
+        """Create the lookup indexes and refresh planner stats if any were missing"""
+        cursor = self.conn.cursor()
+
+        cursor.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE type = 'index' AND name IN (?, ?)",
+            ("idx_model_time", "idx_model_chat_action")
+        )
+        if cursor.fetchone()[0] < 2:
+            cursor.executescript(INDEX_SCHEMA)
+            cursor.execute("ANALYZE model_chat")
+            self.conn.commit()
+
+    def _ensure_fts(self):
+        """Create and backfill the FTS5 keyword index on first use"""
+        cursor = self.conn.cursor()
+
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'model_chat_fts'"
+        )
+        if cursor.fetchone() is None:
+            cursor.executescript(FTS_SCHEMA)
+            cursor.execute("INSERT INTO model_chat_fts(model_chat_fts) VALUES ('rebuild')")
+            self.conn.commit()
+
+    def _data_version(self):
+        """Cheap change marker for model_chat: (max id, row count)"""
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT MAX(id), COUNT(*) FROM model_chat")
+        return tuple(cursor.fetchone())
+
     def get_overview(self):
         """Get overview statistics"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        version = self._data_version()
+        cached_version, cached = self._overview_cache
+        if version == cached_version:
+            return cached
+
+        cursor = self.conn.cursor()
 
         # Total messages
-        cursor.execute("SELECT COUNT(*) FROM model_chat")
-        total = cursor.fetchone()[0]
+        total = version[1]
 
         # By model
         cursor.execute("""
@@ -56,154 +184,218 @@ class LocalDataAnalyzer:
         """)
         date_range = cursor.fetchone()
 
-        conn.close()
-
-        return {
+        overview = {
             "total": total,
             "by_model": by_model,
             "date_range": date_range
         }
+        self._overview_cache = (version, overview)
+        return overview
 
-    def search_reasoning(self, keyword: str, model_name: str = None, limit: int = 10):
-        """Search chain of thought for keyword"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
+    def search_reasoning(self, keyword: str, model_name: str = None, limit: int = 10,
+                         regex: bool = False):
+        """Search chain of thought for keyword
 
-        if model_name:
-            query = """
+        With regex=True the keyword is a regular expression evaluated by the
+        REGEXP function, for patterns the FTS tokenizer can't express.
+        """
+        cursor = self.conn.cursor()
+
+        if regex:
+            model_filter = "model_name = ? AND" if model_name else ""
+            query = f"""
                 SELECT id, model_name, timestamp,
-                       SUBSTR(reasoning, 1, 300) as preview
+                       SUBSTR(reasoning, 1, ?) as preview
                 FROM model_chat
-                WHERE model_name = ? AND
-                      (reasoning LIKE ? OR raw_content LIKE ?)
+                WHERE {model_filter}
+                      (reasoning REGEXP ? OR raw_content REGEXP ?)
                 ORDER BY timestamp DESC
                 LIMIT ?
             """
-            cursor.execute(query, (model_name, f"%{keyword}%", f"%{keyword}%", limit))
+            params = (model_name,) if model_name else ()
+            cursor.execute(query, (PREVIEW_CHARS,) + params + (keyword, keyword, limit))
+            return cursor.fetchall()
+
+        # Rank candidates on the index alone, then hydrate only the top K rows
+        if model_name:
+            cursor.execute("""
+                SELECT model_chat_fts.rowid
+                FROM model_chat_fts
+                JOIN model_chat mc ON mc.id = model_chat_fts.rowid
+                WHERE model_chat_fts MATCH ? AND mc.model_name = ?
+                ORDER BY bm25(model_chat_fts)
+                LIMIT ?
+            """, (fts_phrase(keyword), model_name, limit))
         else:
-            query = """
-                SELECT id, model_name, timestamp,
-                       SUBSTR(reasoning, 1, 300) as preview
-                FROM model_chat
-                WHERE reasoning LIKE ? OR raw_content LIKE ?
-                ORDER BY timestamp DESC
+            cursor.execute("""
+                SELECT rowid
+                FROM model_chat_fts
+                WHERE model_chat_fts MATCH ?
+                ORDER BY bm25(model_chat_fts)
                 LIMIT ?
-            """
-            cursor.execute(query, (f"%{keyword}%", f"%{keyword}%", limit))
+            """, (fts_phrase(keyword), limit))
 
-        results = cursor.fetchall()
-        conn.close()
-        return results
+        ids = [row[0] for row in cursor.fetchall()]
+        if not ids:
+            return []
+
+        placeholders = ", ".join("?" for _ in ids)
+        cursor.execute(f"""
+            SELECT id, model_name, timestamp,
+                   SUBSTR(reasoning, 1, ?) as preview
+            FROM model_chat
+            WHERE id IN ({placeholders})
+        """, (PREVIEW_CHARS, *ids))
+
+        rank = {row_id: i for i, row_id in enumerate(ids)}
+        return sorted(cursor.fetchall(), key=lambda row: rank[row['id']])
 
     def get_trading_decisions_stats(self):
         """Analyze trading decisions across all messages"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        version = self._data_version()
+        cached_version, cached = self._decisions_cache
+        if version == cached_version:
+            return cached
+
+        cursor = self.conn.cursor()
 
+        # Nest per-model action counts in SQL rather than in a Python loop
         cursor.execute("""
-            SELECT model_name, action, COUNT(*) as count
-            FROM model_chat
-            WHERE action IS NOT NULL AND action != ''
-            GROUP BY model_name, action
-            ORDER BY model_name, count DESC
+            SELECT model_name, json_group_object(action, count)
+            FROM (
+                SELECT model_name, action, COUNT(*) as count
+                FROM model_chat
+                WHERE action IS NOT NULL AND action != ''
+                GROUP BY model_name, action
+                ORDER BY model_name, count DESC
+            )
+            GROUP BY model_name
         """)
 
-        results = cursor.fetchall()
-        conn.close()
-
-        # Organize by model
-        by_model = defaultdict(dict)
-        for model, action, count in results:
-            by_model[model][action] = count
+        by_model = {model: json.loads(actions) for model, actions in cursor}
 
+        self._decisions_cache = (version, by_model)
         return by_model
 
-    def analyze_keywords(self, keywords: list):
-        """Count occurrences of keywords in reasoning"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def analyze_keywords(self, keywords: list, substring: bool = False):
+        """Count occurrences of keywords in reasoning
 
-        results = {}
-        for keyword in keywords:
-            cursor.execute("""
-                SELECT COUNT(*)
-                FROM model_chat
-                WHERE reasoning LIKE ? OR raw_content LIKE ?
-            """, (f"%{keyword}%", f"%{keyword}%"))
-            count = cursor.fetchone()[0]
-            results[keyword] = count
+        By default keywords are matched as FTS5 phrases. With substring=True
+        every row is scanned once for raw (case-insensitive) substrings.
+        """
+        if not keywords:
+            return {}
+        if substring:
+            return self._count_substrings(keywords)
 
-        conn.close()
-        return results
+        cursor = self.conn.cursor()
+
+        # One roundtrip: each keyword becomes a scalar index lookup
+        columns = ", ".join(
+            "(SELECT COUNT(*) FROM model_chat_fts WHERE model_chat_fts MATCH ?)"
+            for _ in keywords
+        )
+        cursor.execute(f"SELECT {columns}", [fts_phrase(kw) for kw in keywords])
+        counts = cursor.fetchone()
+        return dict(zip(keywords, counts))
+
+    def _count_substrings(self, keywords: list):
+        """Count rows containing each keyword in a single pass over model_chat"""
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT LOWER(COALESCE(reasoning, '') || char(0) || COALESCE(raw_content, ''))
+            FROM model_chat
+        """)
+
+        needles = {kw.lower() for kw in keywords}
+        hits = Counter()
+        if ahocorasick is not None:
+            automaton = ahocorasick.Automaton()
+            for needle in needles:
+                automaton.add_word(needle, needle)
+            automaton.make_automaton()
+            for (text,) in cursor:
+                hits.update({needle for _, needle in automaton.iter(text)})
+        else:
+            for (text,) in cursor:
+                hits.update(needle for needle in needles if needle in text)
+
+        return {kw: hits[kw.lower()] for kw in keywords}
 
     def compare_models(self, keywords: list):
         """Compare how often different models use certain concepts"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        # Get all models
-        cursor.execute("SELECT DISTINCT model_name FROM model_chat")
-        models = [row[0] for row in cursor.fetchall()]
-
-        results = {}
-        for model in models:
-            results[model] = {}
-            for keyword in keywords:
-                cursor.execute("""
-                    SELECT COUNT(*)
-                    FROM model_chat
-                    WHERE model_name = ? AND
-                          (reasoning LIKE ? OR raw_content LIKE ?)
-                """, (model, f"%{keyword}%", f"%{keyword}%"))
-                count = cursor.fetchone()[0]
-                results[model][keyword] = count
-
-        conn.close()
+        cursor = self.conn.cursor()
+
+        # Keywords arrive as one JSON array; each drives an FTS lookup and only
+        # matching rows are joined back to model_chat for their model name
+        phrases = {fts_phrase(kw): kw for kw in keywords}
+        cursor.execute("""
+            WITH kws(phrase) AS (SELECT value FROM json_each(?))
+            SELECT mc.model_name, kws.phrase, COUNT(*)
+            FROM kws
+            JOIN model_chat_fts ON model_chat_fts MATCH kws.phrase
+            JOIN model_chat mc ON mc.id = model_chat_fts.rowid
+            GROUP BY mc.model_name, kws.phrase
+        """, (json.dumps(list(phrases)),))
+
+        # Models with no hits come from the (cached) overview, not another scan
+        results = {
+            model: dict.fromkeys(keywords, 0)
+            for model, _ in self.get_overview()["by_model"]
+        }
+        for model, phrase, count in cursor:
+            counts = results.setdefault(model, dict.fromkeys(keywords, 0))
+            counts[phrases[phrase]] = count
         return results
 
     def export_model_reasoning(self, model_name: str, output_file: Path, limit: int = None):
-        """Export all reasoning from a specific model"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-
-        if limit:
+        """Export all reasoning from a specific model
+
+        Rows are streamed from the cursor straight to the file, so memory
+        stays flat regardless of how many messages are exported.
+        """
+        cursor = self.conn.cursor()
+
+        # Read transaction so the header count and streamed rows agree
+        cursor.execute("BEGIN")
+        try:
+            cursor.execute(
+                "SELECT COUNT(*) FROM model_chat WHERE model_name = ?", (model_name,)
+            )
+            total = cursor.fetchone()[0]
+            if limit:
+                total = min(total, limit)
+
+            # LIMIT -1 means no limit in SQLite
             cursor.execute("""
-                SELECT id, model_name, timestamp, reasoning, raw_content
+                SELECT id, model_name, timestamp, reasoning
                 FROM model_chat
                 WHERE model_name = ?
                 ORDER BY timestamp DESC
                 LIMIT ?
-            """, (model_name, limit))
-        else:
-            cursor.execute("""
-                SELECT id, model_name, timestamp, reasoning, raw_content
-                FROM model_chat
-                WHERE model_name = ?
-                ORDER BY timestamp DESC
-            """, (model_name,))
-
-        messages = cursor.fetchall()
-        conn.close()
-
-        # Write to file
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(f"# {model_name} - Trading Reasoning Export\n")
-            f.write(f"# Total messages: {len(messages)}\n")
-            f.write(f"# Exported: {datetime.now().isoformat()}\n\n")
-            f.write("=" * 80 + "\n\n")
-
-            for msg in messages:
-                f.write(f"Message ID: {msg['id']}\n")
-                f.write(f"Timestamp: {msg['timestamp']}\n")
-                f.write(f"Model: {msg['model_name']}\n\n")
-                f.write("REASONING:\n")
-                f.write("-" * 80 + "\n")
-                f.write(msg['reasoning'] or "(empty)")
-                f.write("\n" + "=" * 80 + "\n\n")
-
-        return len(messages)
+            """, (model_name, limit or -1))
+
+            # Write to file: one formatted chunk per message, drained by writelines
+            with open(output_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
+                f.write(
+                    f"# {model_name} - Trading Reasoning Export\n"
+                    f"# Total messages: {total}\n"
+                    f"# Exported: {datetime.now().isoformat()}\n\n"
+                    f"{EXPORT_SEPARATOR}\n\n"
+                )
+                f.writelines(
+                    EXPORT_MESSAGE_TEMPLATE.format(
+                        id=msg['id'],
+                        timestamp=msg['timestamp'],
+                        model_name=msg['model_name'],
+                        reasoning=msg['reasoning'] or "(empty)"
+                    )
+                    for msg in cursor
+                )
+        finally:
+            self.conn.commit()
+
+        return total
 
 
 def interactive_menu():
@@ -249,15 +441,22 @@ def interactive_menu():
         if choice != "q":
             Prompt.ask("\nPress Enter to continue")
 
+    analyzer.close()
+
 
 def search_keyword(analyzer):
     """Search for keyword"""
     console.print("\n[bold]Search Reasoning[/bold]\n")
     keyword = Prompt.ask("Enter keyword")
     model = Prompt.ask("Filter by model (leave empty for all)", default="")
+    regex = Confirm.ask("Treat keyword as a regular expression?", default=False)
 
     model = model if model else None
-    results = analyzer.search_reasoning(keyword, model, limit=10)
+    try:
+        results = analyzer.search_reasoning(keyword, model, limit=10, regex=regex)
+    except sqlite3.OperationalError as e:
+        console.print(f"[red]Invalid search: {e}[/red]")
+        return
 
     if not results:
         console.print(f"[yellow]No results found for '{keyword}'[/yellow]")
@@ -276,7 +475,7 @@ def search_keyword(analyzer):
             str(row['id']),
             row['model_name'],
             row['timestamp'][:19],
-            row['preview'][:100] + "..."
+            row['preview'][:PREVIEW_CHARS] + "..."
         )
 
     console.print(table)
@@ -311,8 +510,10 @@ def analyze_keyword_frequency(analyzer):
         "leverage", "position size", "volatility"
     ]
 
+    substring = Confirm.ask("Match raw substrings instead of whole words?", default=False)
+
     console.print("Analyzing common trading keywords...\n")
-    results = analyzer.analyze_keywords(keywords)
+    results = analyzer.analyze_keywords(keywords, substring=substring)
 
     table = Table()
     table.add_column("Keyword", style="cyan")
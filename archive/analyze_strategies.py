@@ -41,6 +41,7 @@ class StrategyAnalyzer:
 
     def __init__(self):
         self.query_library = self._build_query_library()
+        self._by_category = self._group_by_category()
 
     def _build_query_library(self) -> Dict[str, Dict]:
         """Build library of pre-defined queries"""
@@ -117,11 +118,8 @@ class StrategyAnalyzer:
             }
         }
 
-    def display_query_library(self):
-        """Display available query templates"""
-        console.print("\n[bold cyan]Query Library[/bold cyan]\n")
-
-        # Group by category
+    def _group_by_category(self) -> Dict[str, List]:
+        """Group the query library by category, both levels pre-sorted"""
         by_category = {}
         for query_id, query_data in self.query_library.items():
             category = query_data["category"]
@@ -129,8 +127,17 @@ class StrategyAnalyzer:
                 by_category[category] = []
             by_category[category].append((query_id, query_data))
 
+        return {
+            category: sorted(by_category[category])
+            for category in sorted(by_category.keys())
+        }
+
+    def display_query_library(self):
+        """Display available query templates"""
+        console.print("\n[bold cyan]Query Library[/bold cyan]\n")
+
         # Display each category
-        for category in sorted(by_category.keys()):
+        for category, queries in self._by_category.items():
             console.print(f"[bold]{category}:[/bold]")
 
             table = Table(show_header=False, box=None)
@@ -138,7 +145,7 @@ class StrategyAnalyzer:
             table.add_column("Name", style="green")
             table.add_column("Description", style="dim")
 
-            for query_id, query_data in sorted(by_category[category]):
+            for query_id, query_data in queries:
                 table.add_row(
                     query_id,
                     query_data["name"],
@@ -3,28 +3,41 @@ import sqlite3
 conn = sqlite3.connect('GPT_Implementation_Proposal/collector/nof1_data.db')
 cursor = conn.cursor()
 
-# Check all messages for 'conversations' keyword
-cursor.execute('SELECT id, LENGTH(raw_content), raw_content FROM model_chat')
-rows = cursor.fetchall()
 
-for msg_id, length, content in rows:
-    has_conversations = 'conversations' in content
-    has_user_prompt = 'user_prompt' in content
-    has_chain_of_thought = 'chain_of_thought' in content
+def sample_around(msg_id, marker, after):
+    """Fetch raw_content from 50 chars before `marker` to `after` chars past it"""
+    row = conn.execute('''
+        SELECT SUBSTR(raw_content, MAX(1, pos - 50), pos + ? - MAX(1, pos - 50))
+        FROM (SELECT raw_content, INSTR(raw_content, ?) AS pos
+              FROM model_chat WHERE id = ?)
+    ''', (after, marker, msg_id)).fetchone()
+    return row[0]
 
+
+# Check all messages for 'conversations' keyword; the substring tests run
+# inside SQLite so raw_content is never transferred for the scan itself
+cursor.execute('''
+    SELECT id, LENGTH(raw_content),
+           INSTR(raw_content, 'conversations') > 0,
+           INSTR(raw_content, 'user_prompt') > 0,
+           INSTR(raw_content, 'chain_of_thought') > 0
+    FROM model_chat
+''')
+
+for msg_id, length, has_conversations, has_user_prompt, has_chain_of_thought in cursor:
     print(f"\nMessage ID {msg_id} (length={length}):")
-    print(f"  - Has 'conversations': {has_conversations}")
-    print(f"  - Has 'user_prompt': {has_user_prompt}")
-    print(f"  - Has 'chain_of_thought': {has_chain_of_thought}")
+    print(f"  - Has 'conversations': {bool(has_conversations)}")
+    print(f"  - Has 'user_prompt': {bool(has_user_prompt)}")
+    print(f"  - Has 'chain_of_thought': {bool(has_chain_of_thought)}")
 
     if has_conversations:
-        idx = content.find('"conversations"')
+        sample = sample_around(msg_id, '"conversations"', 800)
         print(f"\n  Sample around 'conversations':")
-        print(f"  {content[max(0, idx-50):idx+800]}")
+        print(f"  {sample}")
         break  # Stop after first match
     elif has_user_prompt:
-        idx = content.find('"user_prompt"')
+        sample = sample_around(msg_id, '"user_prompt"', 500)
         print(f"\n  Sample around 'user_prompt':")
-        print(f"  {content[max(0, idx-50):idx+500]}")
+        print(f"  {sample}")
 
 conn.close()
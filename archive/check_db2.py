@@ -1,6 +1,13 @@
 import sqlite3
 import json
 
+# orjson parses large blobs several times faster; it raises a subclass of
+# json.JSONDecodeError, so the handler below covers both
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
 conn = sqlite3.connect('GPT_Implementation_Proposal/collector/nof1_data.db')
 cursor = conn.cursor()
 
@@ -11,7 +18,7 @@ content = row[0]
 
 # Try to parse as JSON
 try:
-    data = json.loads(content)
+    data = json_loads(content)
     print("Successfully parsed as JSON")
     print(f"Top-level keys: {list(data.keys())}")
 
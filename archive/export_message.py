@@ -9,7 +9,7 @@ def export_message(msg_id):
     cursor = conn.cursor()
 
     cursor.execute("""
-        SELECT id, model_name, timestamp, reasoning
+        SELECT id, model_name, timestamp, reasoning, LENGTH(reasoning)
         FROM model_chat
         WHERE id = ?
     """, (msg_id,))
@@ -20,7 +20,7 @@ def export_message(msg_id):
         print(f"Message ID {msg_id} not found")
         return
 
-    msg_id, model_name, timestamp, reasoning = row
+    msg_id, model_name, timestamp, reasoning, length = row
 
     output_file = f"extracted_message_{msg_id}.txt"
 
@@ -28,12 +28,12 @@ def export_message(msg_id):
         f.write(f"Message ID: {msg_id}\n")
         f.write(f"Model: {model_name}\n")
         f.write(f"Timestamp: {timestamp}\n")
-        f.write(f"Extracted Reasoning Length: {len(reasoning):,} chars\n")
+        f.write(f"Extracted Reasoning Length: {length:,} chars\n")
         f.write("="*80 + "\n\n")
         f.write(reasoning)
 
     print(f"Extracted content saved to: {output_file}")
-    print(f"Length: {len(reasoning):,} characters")
+    print(f"Length: {length:,} characters")
 
     conn.close()
 
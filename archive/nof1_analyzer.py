@@ -6,108 +6,396 @@ Analyzes DeepSeek's reasoning patterns to identify systematic strategies
 
 import sqlite3
 import json
+import multiprocessing
+import os
 import re
 from datetime import datetime
-from typing import Dict, List, Tuple
-from collections import Counter, defaultdict
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from collections import Counter, defaultdict, namedtuple
+from functools import lru_cache, wraps
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None  # keyword detection falls back to per-keyword `in` checks
+
+try:
+    import re2 as regex_engine  # google-re2: linear-time DFA, no backtracking
+except ImportError:
+    regex_engine = re
+
+
+def build_keyword_automaton(keyword_lists: Dict[str, List[str]]):
+    """One Aho-Corasick automaton mapping each keyword to the lists it is in
+    
+    Returns None when pyahocorasick is not installed.
+    """
+    if ahocorasick is None:
+        return None
+    
+    kinds = defaultdict(set)
+    for kind, keywords in keyword_lists.items():
+        for keyword in keywords:
+            kinds[keyword].add(kind)
+    
+    automaton = ahocorasick.Automaton()
+    for keyword, keyword_kinds in kinds.items():
+        automaton.add_word(keyword, frozenset(keyword_kinds))
+    automaton.make_automaton()
+    return automaton
+
+
+@lru_cache(maxsize=None)
+def message_type(columns: Tuple[str, ...]):
+    """namedtuple class for a get_messages column selection"""
+    return namedtuple('Message', columns)
+
+
+def cached_on_db(method):
+    """Memoize an analyzer method per arguments until the database changes"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (method.__name__, args, tuple(sorted(kwargs.items())))
+        version = self._data_version()
+        hit = self._cache.get(key)
+        if hit is not None and hit[0] == version:
+            return hit[1]
+        result = method(self, *args, **kwargs)
+        self._cache[key] = (version, result)
+        return result
+    return wrapper
 
 
 class NOF1Analyzer:
     """Analyze scraped ModelChat data to extract trading patterns"""
     
-    def __init__(self, db_path: str = "nof1_data.db"):
-        self.db_path = db_path
+    # Key pattern indicators, fused into one alternation so each message
+    # is scanned once rather than once per pattern
+    PHRASE_RE = regex_engine.compile('|'.join((
+        r'stop[- ]loss',
+        r'take[- ]profit',
+        r'invalidation',
+        r'confidence',
+        r'breakout',
+        r'momentum',
+        r'trend',
+        r'support',
+        r'resistance',
+        r'volume',
+        r'\d+x leverage',
+        r'long position',
+        r'short position',
+        r'entry',
+        r'exit',
+        r'risk[- ]reward'
+    )))
+    
+    # Each alternative keeps its own groups; a match fills only its own
+    TIMEFRAME_RE = regex_engine.compile('|'.join(f'(?:{p})' for p in (
+        r'(\d+)[-\s]?(min|minute)',
+        r'(\d+)[-\s]?(hour|hr)',
+        r'(\d+)[-\s]?(day)',
+        r'(daily|hourly|weekly)',
+        r'(short[- ]term|medium[- ]term|long[- ]term)'
+    )))
+    
+    LEVERAGE_RE = regex_engine.compile(r'(\d+)x\s*leverage')
+    
+    ENTRY_KEYWORDS = [
+        'opening', 'entering', 'taking position', 'buying', 'going long', 
+        'going short', 'initiating', 'entry'
+    ]
+    
+    EXIT_KEYWORDS = ['closing', 'exiting', 'exit', 'sold', 'closed position']
+    
+    # Literals the entry-pattern and exit-category checks look for
+    SIGNAL_LITERALS = ['stop', 'sl', 'invalid', 'invalidat', 'momentum', 'accelerat',
+                       'target', 'profit', 'loss']
+    
+    # Everything a message is tested for, by tag: 'entry'/'exit' for the
+    # keyword lists, and each signal literal under its own name
+    KEYWORD_LISTS = {
+        'entry': ENTRY_KEYWORDS,
+        'exit': EXIT_KEYWORDS,
+        **{literal: [literal] for literal in SIGNAL_LITERALS}
+    }
+    
+    # One automaton over all of them, so a single scan of a message answers
+    # every keyword and literal test
+    KEYWORD_AUTOMATON = build_keyword_automaton(KEYWORD_LISTS)
+    
+    # Messages handed to worker processes per round when scanning in parallel
+    SCAN_BATCH = 4096
+    
+    # A message's analyzable text: reasoning, falling back to raw_content
+    TEXT_SQL = "COALESCE(NULLIF(reasoning, ''), raw_content, '')"
+    
+    # Columns computed by SQLite rather than stored in model_chat
+    COMPUTED_COLUMNS = {'text': TEXT_SQL}
     
-    def get_messages(self, model_name: str = None, limit: int = None) -> List[Dict]:
-        """Retrieve messages from database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    # Columns the analyses read; raw_content/reasoning can be tens of KB so
+    # nothing beyond what a caller asks for is pulled from SQLite, and only
+    # the one that applies comes back, as `text`
+    DEFAULT_COLUMNS = ['scraped_at', 'model_name', 'text', 'confidence']
+    
+    # Indexes behind the per-model scraped_at ordering and aggregates
+    INDEX_SQL = '''
+        CREATE INDEX IF NOT EXISTS idx_model_scraped ON model_chat(model_name, scraped_at);
+        CREATE INDEX IF NOT EXISTS idx_scraped ON model_chat(scraped_at);
+    '''
+    
+    # Connection pragmas; WAL itself persists in the database file
+    PRAGMA_SQL = '''
+        PRAGMA journal_mode = WAL;
+        PRAGMA synchronous = NORMAL;
+        PRAGMA temp_store = MEMORY;
+        PRAGMA mmap_size = 268435456;
+    '''
+    
+    def __init__(self, db_path: str = "nof1_data.db", processes: int = 1):
+        self.db_path = db_path
+        self.processes = processes
+        self._cache = {}
         
+        # One connection for the analyzer's lifetime instead of one per query
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.executescript(self.PRAGMA_SQL)
+        self.conn.executescript(self.INDEX_SQL)
+    
+    def close(self):
+        """Close the database connection"""
+        self.conn.close()
+    
+    def _data_version(self) -> Tuple:
+        """mtimes of the database and its WAL file; writes touch one of them"""
+        return tuple(
+            os.stat(path).st_mtime_ns if os.path.exists(path) else None
+            for path in (self.db_path, f'{self.db_path}-wal')
+        )
+    
+    def get_messages(self, model_name: str = None, limit: int = None,
+                     containing: List[str] = None, columns: List[str] = None) -> Iterator[Tuple]:
+        """Stream messages from database, newest first
+        
+        Rows are yielded straight off the cursor, so only one message is held
+        in memory at a time, as namedtuples with one field per column.
+        
+        containing: lowercase keywords; only messages whose text includes at
+        least one of them are returned, so non-matching rows never leave SQLite
+        columns: model_chat columns or COMPUTED_COLUMNS to fetch
+        (default DEFAULT_COLUMNS)
+        """
+        columns = columns or self.DEFAULT_COLUMNS
+        cursor = self.conn.cursor()
+        
+        conditions = []
+        params = ()
         if model_name:
-            query = 'SELECT * FROM model_chat WHERE model_name = ? ORDER BY scraped_at DESC'
-            params = (model_name,)
-        else:
-            query = 'SELECT * FROM model_chat ORDER BY scraped_at DESC'
-            params = ()
-        
-        if limit:
-            query += f' LIMIT {limit}'
+            conditions.append('model_name = ?')
+            params += (model_name,)
+        if containing:
+            # The whole keyword list binds as one JSON array, so the statement
+            # text is the same for every list and needs one parameter
+            conditions.append(
+                f'EXISTS (SELECT 1 FROM json_each(?) '
+                f'WHERE instr(LOWER({self.TEXT_SQL}), json_each.value) > 0)'
+            )
+            params += (json.dumps(containing),)
+        
+        selected = ', '.join(
+            f'{self.COMPUTED_COLUMNS[column]} AS {column}' if column in self.COMPUTED_COLUMNS else column
+            for column in columns
+        )
+        query = f"SELECT {selected} FROM model_chat"
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+        # LIMIT is always bound (-1 = no limit) so the statement text, and
+        # with it sqlite3's cached prepared statement, doesn't vary with limit
+        query += ' ORDER BY scraped_at DESC LIMIT ?'
+        params += (limit or -1,)
+        
+        make_message = message_type(tuple(columns))._make
+        try:
+            cursor.execute(query, params)
+            yield from map(make_message, cursor)
+        finally:
+            cursor.close()
+    
+    def _iter_texts(self, messages: Iterable[Tuple]) -> Iterator[Tuple[Tuple, str]]:
+        """Pair each message with its lowercased text, lowered exactly once"""
+        for msg in messages:
+            yield msg, msg.text.lower()
+    
+    def extract_key_phrases(self, messages: Iterable[Tuple]) -> Counter:
+        """Extract and count key trading phrases"""
+        phrases = Counter()
         
-        cursor.execute(query, params)
+        for _, text in self._iter_texts(messages):
+            phrases.update(self.PHRASE_RE.findall(text))
         
-        columns = [desc[0] for desc in cursor.description]
-        messages = [dict(zip(columns, row)) for row in cursor.fetchall()]
+        return phrases
+    
+    @classmethod
+    def _keyword_kinds(cls, text: str) -> set:
+        """Tags from KEYWORD_LISTS that a lowercased text mentions"""
+        if cls.KEYWORD_AUTOMATON is not None:
+            found = set()
+            for _, keyword_kinds in cls.KEYWORD_AUTOMATON.iter(text):
+                found |= keyword_kinds
+            return found
         
-        conn.close()
-        return messages
+        return {
+            kind for kind, keywords in cls.KEYWORD_LISTS.items()
+            if any(keyword in text for keyword in keywords)
+        }
     
-    def extract_key_phrases(self, messages: List[Dict]) -> Counter:
-        """Extract and count key trading phrases"""
-        phrases = []
-        
-        # Key pattern indicators
-        patterns = [
-            r'stop[- ]loss',
-            r'take[- ]profit',
-            r'invalidation',
-            r'confidence',
-            r'breakout',
-            r'momentum',
-            r'trend',
-            r'support',
-            r'resistance',
-            r'volume',
-            r'\d+x leverage',
-            r'long position',
-            r'short position',
-            r'entry',
-            r'exit',
-            r'risk[- ]reward'
-        ]
+    def _entry_signal(self, msg: Tuple, text: str) -> Dict:
+        """Position details for one entry message"""
+        return {
+            'timestamp': msg.scraped_at,
+            'confidence': msg.confidence,
+            **self._entry_details(text, self._keyword_kinds(text))
+        }
+    
+    @classmethod
+    def _entry_details(cls, text: str, kinds: set) -> Dict:
+        """The text-derived part of an entry signal; kinds from _keyword_kinds"""
+        # Try to extract position details
+        position_info = {
+            'reasoning_snippet': text[:300],
+            'detected_patterns': []
+        }
         
-        for msg in messages:
-            text = msg.get('reasoning') or msg.get('raw_content', '')
-            text = text.lower()
-            
-            for pattern in patterns:
-                matches = re.findall(pattern, text)
-                phrases.extend(matches)
+        # Extract leverage
+        leverage_match = cls.LEVERAGE_RE.search(text)
+        if leverage_match:
+            position_info['leverage'] = leverage_match.group(1)
+        
+        # Extract stop loss mention
+        if 'stop' in kinds or 'sl' in kinds:
+            position_info['detected_patterns'].append('stop_loss_defined')
+        
+        # Extract invalidation
+        if 'invalid' in kinds:
+            position_info['detected_patterns'].append('invalidation_condition')
         
-        return Counter(phrases)
+        # Extract momentum
+        if 'momentum' in kinds or 'accelerat' in kinds:
+            position_info['detected_patterns'].append('momentum_signal')
+        
+        return position_info
+    
+    @staticmethod
+    def _exit_type(kinds: set) -> str:
+        """Categorize one exit message from its _keyword_kinds"""
+        if 'invalidat' in kinds:
+            return 'invalidation_exits'
+        elif 'target' in kinds or 'profit' in kinds:
+            return 'profit_target_exits'
+        elif 'stop' in kinds or 'loss' in kinds:
+            return 'stop_loss_exits'
+        return 'discretionary_exits'
+    
+    @staticmethod
+    def _count_exits(exit_patterns: Dict) -> Dict:
+        """Add a <key>_count entry for each exit category"""
+        for key in list(exit_patterns):
+            exit_patterns[f'{key}_count'] = len(exit_patterns[key])
+        return exit_patterns
+    
+    @classmethod
+    def _timeframes(cls, text: str) -> Iterator[str]:
+        """Timeframe mentions in one message"""
+        return (' '.join(filter(None, m)) for m in cls.TIMEFRAME_RE.findall(text))
+    
+    @classmethod
+    def _scan_text(cls, text: str) -> Tuple[List[str], Optional[Dict], Optional[Tuple[str, str]], List[str]]:
+        """Everything analyze_texts extracts from one message's raw text
+        
+        Returns (phrases, entry details or None, (exit type, snippet) or None,
+        timeframes). Depends only on the text and class attributes, so it
+        can run in a worker process.
+        """
+        text = text.lower()
+        kinds = cls._keyword_kinds(text)
+        return (
+            cls.PHRASE_RE.findall(text),
+            cls._entry_details(text, kinds) if 'entry' in kinds else None,
+            (cls._exit_type(kinds), text[:200]) if 'exit' in kinds else None,
+            list(cls._timeframes(text))
+        )
+    
+    def _scan_messages(self, messages: Iterator[Tuple]) -> Iterator[Tuple[Tuple, Tuple]]:
+        """Pair each message with its _scan_text result, in stream order
+        
+        With processes > 1 the scans fan out to a worker pool. Rows are still
+        read here, in batches, because the connection belongs to this thread.
+        """
+        if self.processes <= 1:
+            for msg in messages:
+                yield msg, self._scan_text(msg.text)
+            return
+        
+        with multiprocessing.Pool(self.processes) as pool:
+            while True:
+                batch = list(islice(messages, self.SCAN_BATCH))
+                if not batch:
+                    break
+                texts = [msg.text for msg in batch]
+                yield from zip(batch, pool.imap(self._scan_text, texts, chunksize=64))
     
+    @cached_on_db
     def analyze_deepseek_strategy(self) -> Dict:
         """Analyze DeepSeek's trading strategy patterns"""
-        messages = self.get_messages(model_name='deepseek-v3.1')
+        model_name = 'deepseek-v3.1'
         
-        if not messages:
+        # Count and date range come from an aggregate, so the message stream
+        # below is only walked once, for phrase extraction
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            SELECT COUNT(*), MIN(scraped_at), MAX(scraped_at)
+            FROM model_chat
+            WHERE model_name = ?
+        ''', (model_name,))
+        total, oldest, newest = cursor.fetchone()
+        
+        if not total:
             return {"error": "No DeepSeek messages found"}
         
         analysis = {
-            'total_messages': len(messages),
-            'date_range': (messages[-1]['scraped_at'], messages[0]['scraped_at']),
+            'total_messages': total,
+            'date_range': (oldest, newest),
             'key_phrases': {},
             'position_patterns': {},
             'confidence_patterns': {},
             'sample_reasoning': []
         }
         
-        # Extract key phrases
-        phrases = self.extract_key_phrases(messages)
+        # Extract key phrases; the single pass also leaves the other text
+        # analyses cached for generate_summary_report
+        phrases = self.analyze_texts(model_name)['key_phrases']
         analysis['key_phrases'] = dict(phrases.most_common(20))
         
-        # Sample reasoning chains
-        for msg in messages[:5]:
+        # Sample reasoning chains, truncated by SQLite rather than in Python
+        cursor.execute(f'''
+            SELECT scraped_at, SUBSTR({self.TEXT_SQL}, 1, 500)
+            FROM model_chat
+            WHERE model_name = ?
+            ORDER BY scraped_at DESC
+            LIMIT 5
+        ''', (model_name,))
+        for scraped_at, content in cursor:
             analysis['sample_reasoning'].append({
-                'timestamp': msg['scraped_at'],
-                'content': msg.get('reasoning') or msg.get('raw_content', '')[:500]
+                'timestamp': scraped_at,
+                'content': content
             })
         
         return analysis
     
     def compare_models(self) -> Dict:
         """Compare strategy differences between models"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self.conn.cursor()
         
         # Get message counts per model
         cursor.execute('SELECT model_name, COUNT(*) FROM model_chat GROUP BY model_name')
@@ -128,62 +416,28 @@ class NOF1Analyzer:
                 'max': row[3]
             }
         
-        conn.close()
-        
         return {
             'message_counts': message_counts,
             'confidence_stats': confidence_stats
         }
     
+    @cached_on_db
     def find_entry_signals(self, model_name: str = 'deepseek-v3.1') -> List[Dict]:
         """Extract entry signal patterns from messages"""
-        messages = self.get_messages(model_name=model_name)
-        
-        entry_signals = []
+        # Only messages mentioning an entry keyword come back from SQLite
+        messages = self.get_messages(model_name=model_name, containing=self.ENTRY_KEYWORDS)
         
-        # Entry signal keywords
-        entry_keywords = [
-            'opening', 'entering', 'taking position', 'buying', 'going long', 
-            'going short', 'initiating', 'entry'
-        ]
-        
-        for msg in messages:
-            text = (msg.get('reasoning') or msg.get('raw_content', '')).lower()
-            
-            # Check if this is an entry signal
-            if any(keyword in text for keyword in entry_keywords):
-                # Try to extract position details
-                position_info = {
-                    'timestamp': msg['scraped_at'],
-                    'confidence': msg.get('confidence'),
-                    'reasoning_snippet': text[:300],
-                    'detected_patterns': []
-                }
-                
-                # Extract leverage
-                leverage_match = re.search(r'(\d+)x\s*leverage', text)
-                if leverage_match:
-                    position_info['leverage'] = leverage_match.group(1)
-                
-                # Extract stop loss mention
-                if 'stop' in text or 'sl' in text:
-                    position_info['detected_patterns'].append('stop_loss_defined')
-                
-                # Extract invalidation
-                if 'invalidation' in text or 'invalid' in text:
-                    position_info['detected_patterns'].append('invalidation_condition')
-                
-                # Extract momentum
-                if 'momentum' in text or 'accelerat' in text:
-                    position_info['detected_patterns'].append('momentum_signal')
-                
-                entry_signals.append(position_info)
-        
-        return entry_signals
+        return [self._entry_signal(msg, text) for msg, text in self._iter_texts(messages)]
     
+    @cached_on_db
     def find_exit_patterns(self, model_name: str = 'deepseek-v3.1') -> Dict:
         """Analyze exit decision patterns"""
-        messages = self.get_messages(model_name=model_name)
+        # Only messages mentioning an exit keyword come back from SQLite
+        messages = self.get_messages(
+            model_name=model_name,
+            containing=self.EXIT_KEYWORDS,
+            columns=['scraped_at', 'text']
+        )
         
         exit_patterns = {
             'invalidation_exits': [],
@@ -192,59 +446,82 @@ class NOF1Analyzer:
             'discretionary_exits': []
         }
         
-        exit_keywords = ['closing', 'exiting', 'exit', 'sold', 'closed position']
-        
-        for msg in messages:
-            text = (msg.get('reasoning') or msg.get('raw_content', '')).lower()
-            
-            if any(keyword in text for keyword in exit_keywords):
-                exit_info = {
-                    'timestamp': msg['scraped_at'],
-                    'reasoning': text[:200]
-                }
-                
-                # Categorize exit type
-                if 'invalidat' in text:
-                    exit_patterns['invalidation_exits'].append(exit_info)
-                elif 'target' in text or 'profit' in text:
-                    exit_patterns['profit_target_exits'].append(exit_info)
-                elif 'stop' in text or 'loss' in text:
-                    exit_patterns['stop_loss_exits'].append(exit_info)
-                else:
-                    exit_patterns['discretionary_exits'].append(exit_info)
-        
-        # Add counts
-        for key in exit_patterns:
-            exit_patterns[f'{key}_count'] = len(exit_patterns[key])
+        for msg, text in self._iter_texts(messages):
+            exit_patterns[self._exit_type(self._keyword_kinds(text))].append({
+                'timestamp': msg.scraped_at,
+                'reasoning': text[:200]
+            })
         
-        return exit_patterns
+        return self._count_exits(exit_patterns)
     
+    @cached_on_db
     def extract_timeframe_mentions(self, model_name: str = 'deepseek-v3.1') -> Counter:
         """Extract mentioned timeframes"""
-        messages = self.get_messages(model_name=model_name)
+        messages = self.get_messages(model_name=model_name, columns=['text'])
         
-        timeframes = []
-        patterns = [
-            r'(\d+)[-\s]?(min|minute)',
-            r'(\d+)[-\s]?(hour|hr)',
-            r'(\d+)[-\s]?(day)',
-            r'(daily|hourly|weekly)',
-            r'(short[- ]term|medium[- ]term|long[- ]term)'
-        ]
+        timeframes = Counter()
         
-        for msg in messages:
-            text = (msg.get('reasoning') or msg.get('raw_content', '')).lower()
-            for pattern in patterns:
-                matches = re.findall(pattern, text)
-                timeframes.extend([' '.join(m) if isinstance(m, tuple) else m for m in matches])
+        for _, text in self._iter_texts(messages):
+            timeframes.update(self._timeframes(text))
         
-        return Counter(timeframes)
+        return timeframes
+    
+    @cached_on_db
+    def analyze_texts(self, model_name: str = 'deepseek-v3.1') -> Dict:
+        """Phrases, entry signals, exit patterns and timeframes in one pass
+        
+        Equivalent to extract_key_phrases, find_entry_signals,
+        find_exit_patterns and extract_timeframe_mentions combined, but each
+        message is fetched and lowercased once instead of up to four times.
+        The per-message scans run on `processes` worker processes.
+        """
+        messages = self.get_messages(
+            model_name=model_name,
+            columns=['scraped_at', 'text', 'confidence']
+        )
+        
+        phrases = Counter()
+        entry_signals = []
+        exit_patterns = {
+            'invalidation_exits': [],
+            'profit_target_exits': [],
+            'stop_loss_exits': [],
+            'discretionary_exits': []
+        }
+        timeframes = Counter()
+        
+        for msg, (found_phrases, entry, exit_found, found_timeframes) in self._scan_messages(messages):
+            phrases.update(found_phrases)
+            
+            if entry is not None:
+                entry_signals.append({
+                    'timestamp': msg.scraped_at,
+                    'confidence': msg.confidence,
+                    **entry
+                })
+            
+            if exit_found is not None:
+                exit_type, snippet = exit_found
+                exit_patterns[exit_type].append({
+                    'timestamp': msg.scraped_at,
+                    'reasoning': snippet
+                })
+            
+            timeframes.update(found_timeframes)
+        
+        return {
+            'key_phrases': phrases,
+            'entry_signals': entry_signals,
+            'exit_patterns': self._count_exits(exit_patterns),
+            'timeframes': timeframes
+        }
     
     def generate_summary_report(self, output_file: str = "deepseek_analysis.txt"):
         """Generate comprehensive analysis report"""
         
         print("🔍 Analyzing DeepSeek Trading Strategy...\n")
         
+        model_name = 'deepseek-v3.1'
         report = []
         report.append("=" * 70)
         report.append("DEEPSEEK V3.1 TRADING STRATEGY ANALYSIS")
@@ -264,8 +541,10 @@ class NOF1Analyzer:
             report.append(f"  {phrase:30s} {count:>5d} occurrences")
         report.append("")
         
-        # Entry signals
-        entry_signals = self.find_entry_signals()
+        # Entry signals, exits and timeframes all come from the same pass
+        # over the messages that produced the key phrases
+        texts = self.analyze_texts(model_name)
+        entry_signals = texts['entry_signals']
         report.append(f"🎯 Entry Signals Detected: {len(entry_signals)}")
         report.append("-" * 70)
         if entry_signals:
@@ -278,7 +557,7 @@ class NOF1Analyzer:
         report.append("")
         
         # Exit patterns
-        exit_patterns = self.find_exit_patterns()
+        exit_patterns = texts['exit_patterns']
         report.append("🚪 Exit Pattern Analysis:")
         report.append("-" * 70)
         report.append(f"  Invalidation Exits: {exit_patterns.get('invalidation_exits_count', 0)}")
@@ -288,7 +567,7 @@ class NOF1Analyzer:
         report.append("")
         
         # Timeframes
-        timeframes = self.extract_timeframe_mentions()
+        timeframes = texts['timeframes']
         if timeframes:
             report.append("⏰ Timeframe Mentions:")
             report.append("-" * 70)
@@ -329,10 +608,12 @@ def main():
     parser.add_argument('--entries', action='store_true', help='Show entry signals')
     parser.add_argument('--exits', action='store_true', help='Show exit patterns')
     parser.add_argument('--compare', action='store_true', help='Compare all models')
+    parser.add_argument('--processes', type=int, default=1,
+                        help='Worker processes for message scanning (0 = one per CPU)')
     
     args = parser.parse_args()
     
-    analyzer = NOF1Analyzer(db_path=args.db)
+    analyzer = NOF1Analyzer(db_path=args.db, processes=args.processes or os.cpu_count())
     
     if args.report:
         analyzer.generate_summary_report()
@@ -364,6 +645,8 @@ def main():
         print(f"Messages: {strategy.get('total_messages', 0)}")
         print(f"Top phrases: {list(strategy.get('key_phrases', {}).keys())[:5]}")
         print("\nUse --report for full analysis")
+    
+    analyzer.close()
 
 
 if __name__ == '__main__':
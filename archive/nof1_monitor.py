@@ -5,8 +5,10 @@ Shows latest messages and statistics as they're scraped
 """
 
 import sqlite3
+import json
 import time
 import os
+import sys
 from datetime import datetime, timedelta
 from typing import Dict, List
 
@@ -14,18 +16,41 @@ from typing import Dict, List
 class NOF1Monitor:
     """Real-time monitoring dashboard for scraper"""
     
+    # Per-connection read pragmas only. The monitor never writes: WAL mode
+    # and the scraped_at indexes its queries use (idx_model_scraped,
+    # idx_scraped) are set up by the scraper's init_database
+    PRAGMA_SQL = '''
+        PRAGMA temp_store = MEMORY;
+        PRAGMA mmap_size = 268435456;
+    '''
+    
     def __init__(self, db_path: str = "nof1_data.db", refresh_interval: int = 10):
         self.db_path = db_path
         self.refresh_interval = refresh_interval
         
+        # Lines currently on screen, for incremental dashboard redraws
+        self._screen = []
+        
+        # One connection for the monitor's lifetime instead of one per query
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.executescript(self.PRAGMA_SQL)
+    
+    def close(self):
+        """Close the database connection"""
+        self.conn.close()
+        
     def clear_screen(self):
         """Clear terminal screen"""
-        os.system('cls' if os.name == 'nt' else 'clear')
+        if os.name == 'nt':
+            os.system('cls')
+        else:
+            # VT100 clear + cursor home; no shell/clear process per refresh
+            sys.stdout.write('\x1b[2J\x1b[H')
+            sys.stdout.flush()
     
     def get_recent_activity(self, minutes: int = 30) -> List[Dict]:
         """Get messages from last N minutes"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self.conn.cursor()
         
         cutoff = (datetime.now() - timedelta(minutes=minutes)).isoformat()
         
@@ -40,45 +65,38 @@ class NOF1Monitor:
         
         columns = ['model_name', 'timestamp', 'scraped_at', 'snippet']
         messages = [dict(zip(columns, row)) for row in cursor.fetchall()]
-        
-        conn.close()
         return messages
     
     def get_stats_summary(self) -> Dict:
         """Get overall statistics"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self.conn.cursor()
         
-        # Total messages
-        cursor.execute('SELECT COUNT(*) FROM model_chat')
-        total = cursor.fetchone()[0]
-        
-        # By model
-        cursor.execute('''
-            SELECT model_name, COUNT(*) 
-            FROM model_chat 
-            GROUP BY model_name 
-            ORDER BY COUNT(*) DESC
-        ''')
-        by_model = dict(cursor.fetchall())
-        
-        # Recent activity (last hour)
         one_hour_ago = (datetime.now() - timedelta(hours=1)).isoformat()
-        cursor.execute('''
-            SELECT COUNT(*) FROM model_chat WHERE scraped_at > ?
-        ''', (one_hour_ago,))
-        recent_count = cursor.fetchone()[0]
         
-        # Last scraper run
+        # Every figure in one roundtrip; the total is summed from the
+        # per-model counts, so model_chat is only grouped once
         cursor.execute('''
-            SELECT run_timestamp, new_messages 
-            FROM scraper_runs 
-            ORDER BY id DESC 
-            LIMIT 1
-        ''')
-        last_run = cursor.fetchone()
-        
-        conn.close()
+            WITH by_model AS (
+                SELECT model_name, COUNT(*) AS messages
+                FROM model_chat 
+                GROUP BY model_name 
+                ORDER BY messages DESC
+            ),
+            last_run AS (
+                SELECT run_timestamp, new_messages 
+                FROM scraper_runs 
+                ORDER BY id DESC 
+                LIMIT 1
+            )
+            SELECT
+                (SELECT COALESCE(SUM(messages), 0) FROM by_model),
+                (SELECT json_group_array(json_array(model_name, messages)) FROM by_model),
+                (SELECT COUNT(*) FROM model_chat WHERE scraped_at > ?),
+                (SELECT json_array(run_timestamp, new_messages) FROM last_run)
+        ''', (one_hour_ago,))
+        total, by_model, recent_count, last_run = cursor.fetchone()
+        by_model = dict(json.loads(by_model))
+        last_run = tuple(json.loads(last_run)) if last_run else None
         
         return {
             'total_messages': total,
@@ -87,71 +105,105 @@ class NOF1Monitor:
             'last_run': last_run
         }
     
-    def format_time_ago(self, timestamp: str) -> str:
-        """Format timestamp as 'X minutes ago'"""
+    def format_time_ago(self, timestamp: str, now: datetime = None) -> str:
+        """Format timestamp as 'X minutes ago'
+        
+        now: reference time; pass one snapshot when formatting a batch of rows
+        so the clock is read once per refresh rather than once per row
+        """
         try:
-            dt = datetime.fromisoformat(timestamp)
-            delta = datetime.now() - dt
+            seconds = ((now or datetime.now()) - datetime.fromisoformat(timestamp)).total_seconds()
             
-            if delta.total_seconds() < 60:
-                return f"{int(delta.total_seconds())}s ago"
-            elif delta.total_seconds() < 3600:
-                return f"{int(delta.total_seconds() / 60)}m ago"
-            elif delta.total_seconds() < 86400:
-                return f"{int(delta.total_seconds() / 3600)}h ago"
+            if seconds < 60:
+                return f"{int(seconds)}s ago"
+            elif seconds < 3600:
+                return f"{int(seconds / 60)}m ago"
+            elif seconds < 86400:
+                return f"{int(seconds / 3600)}h ago"
             else:
-                return f"{int(delta.total_seconds() / 86400)}d ago"
+                return f"{int(seconds / 86400)}d ago"
         except:
             return timestamp
     
-    def display_dashboard(self):
-        """Display the monitoring dashboard"""
-        self.clear_screen()
+    def render_dashboard(self) -> List[str]:
+        """Build the dashboard as a list of screen lines"""
+        lines = []
         
-        print("┏" + "━" * 78 + "┓")
-        print("┃" + " " * 20 + "NOF1.AI SCRAPER - LIVE MONITOR" + " " * 27 + "┃")
-        print("┗" + "━" * 78 + "┛")
-        print()
+        lines.append("┏" + "━" * 78 + "┓")
+        lines.append("┃" + " " * 20 + "NOF1.AI SCRAPER - LIVE MONITOR" + " " * 27 + "┃")
+        lines.append("┗" + "━" * 78 + "┛")
+        lines.append("")
         
         # Get data
         stats = self.get_stats_summary()
         recent = self.get_recent_activity(minutes=30)
+        now = datetime.now()
         
         # Display stats
-        print("📊 OVERALL STATISTICS")
-        print("─" * 80)
-        print(f"  Total Messages:     {stats['total_messages']:,}")
-        print(f"  Last Hour:          {stats['recent_hour']} new messages")
+        lines.append("📊 OVERALL STATISTICS")
+        lines.append("─" * 80)
+        lines.append(f"  Total Messages:     {stats['total_messages']:,}")
+        lines.append(f"  Last Hour:          {stats['recent_hour']} new messages")
         
         if stats['last_run']:
             run_time, new_msgs = stats['last_run']
-            print(f"  Last Scrape:        {self.format_time_ago(run_time)} ({new_msgs} new)")
+            lines.append(f"  Last Scrape:        {self.format_time_ago(run_time, now)} ({new_msgs} new)")
         
-        print()
-        print("  Messages by Model:")
+        lines.append("")
+        lines.append("  Messages by Model:")
         for model, count in stats['by_model'].items():
             bar_length = int((count / stats['total_messages']) * 30)
             bar = "█" * bar_length + "░" * (30 - bar_length)
-            print(f"    {model:20s} {bar} {count:>4d}")
+            lines.append(f"    {model:20s} {bar} {count:>4d}")
         
-        print()
-        print("🔴 RECENT ACTIVITY (Last 30 minutes)")
-        print("─" * 80)
+        lines.append("")
+        lines.append("🔴 RECENT ACTIVITY (Last 30 minutes)")
+        lines.append("─" * 80)
         
         if recent:
             for msg in recent[:10]:
-                time_ago = self.format_time_ago(msg['scraped_at'])
+                time_ago = self.format_time_ago(msg['scraped_at'], now)
                 model = msg['model_name'][:15].ljust(15)
                 snippet = msg['snippet'].replace('\n', ' ')[:45]
                 
-                print(f"  [{time_ago:>8s}] {model} │ {snippet}...")
+                lines.append(f"  [{time_ago:>8s}] {model} │ {snippet}...")
         else:
-            print("  No recent activity")
+            lines.append("  No recent activity")
         
-        print()
-        print("─" * 80)
-        print(f"  Refreshing every {self.refresh_interval}s | Press Ctrl+C to exit")
-        print(f"  Updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        lines.append("")
+        lines.append("─" * 80)
+        lines.append(f"  Refreshing every {self.refresh_interval}s | Press Ctrl+C to exit")
+        lines.append(f"  Updated: {now.strftime('%Y-%m-%d %H:%M:%S')}")
+        
+        return lines
+    
+    def display_dashboard(self):
+        """Display the monitoring dashboard
+        
+        After the first draw only the lines that changed since the previous
+        refresh are rewritten, via cursor positioning, instead of clearing
+        and repainting the whole screen.
+        """
+        lines = self.render_dashboard()
+        
+        if os.name == 'nt' or not self._screen:
+            self.clear_screen()
+            print('\n'.join(lines))
+        else:
+            out = []
+            for row, line in enumerate(lines, 1):
+                if row > len(self._screen) or self._screen[row - 1] != line:
+                    # Move to the row, write the line, erase any leftover tail
+                    out.append(f'\x1b[{row};1H{line}\x1b[K')
+            if len(lines) < len(self._screen):
+                # Dashboard got shorter: erase everything below it
+                out.append(f'\x1b[{len(lines) + 1};1H\x1b[J')
+            # Park the cursor below the dashboard, as print() would leave it
+            out.append(f'\x1b[{len(lines) + 1};1H')
+            sys.stdout.write(''.join(out))
+            sys.stdout.flush()
+        
+        self._screen = lines
     
     def run(self):
         """Run continuous monitoring"""
@@ -173,8 +225,7 @@ class NOF1Monitor:
         """Show last N messages (like tail -f)"""
         print(f"📜 Last {count} messages:\n")
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self.conn.cursor()
         
         cursor.execute('''
             SELECT model_name, scraped_at, raw_content
@@ -183,14 +234,13 @@ class NOF1Monitor:
             LIMIT ?
         ''', (count,))
         
+        now = datetime.now()
         for row in cursor.fetchall():
             model, timestamp, content = row
-            print(f"┌─ {model} @ {self.format_time_ago(timestamp)}")
+            print(f"┌─ {model} @ {self.format_time_ago(timestamp, now)}")
             print(f"│  {content[:200].replace(chr(10), ' ')}...")
             print(f"└─")
             print()
-        
-        conn.close()
 
 
 def main():
@@ -212,6 +262,8 @@ def main():
         monitor.tail_messages(count=args.tail)
     else:
         monitor.run()
+    
+    monitor.close()
 
 
 if __name__ == '__main__':
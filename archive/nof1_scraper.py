@@ -5,18 +5,20 @@ Automatically scrapes DeepSeek and other AI model reasoning every 2-3 minutes
 Stores data locally in SQLite with duplicate detection
 """
 
-import time
+import asyncio
 import sqlite3
 import json
 import hashlib
+import re
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional
 import logging
 
 # Try importing Playwright (preferred for JS-heavy sites)
 try:
-    from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeout
+    from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeout
     PLAYWRIGHT_AVAILABLE = True
 except ImportError:
     PLAYWRIGHT_AVAILABLE = False
@@ -34,21 +36,90 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=4096)
+def content_hash(content: str) -> str:
+    """Short sha256 of message content, memoized since every cycle rescrapes
+    mostly the same messages"""
+    return hashlib.sha256(content.encode()).hexdigest()[:16]
+
+
 class NOF1Scraper:
     """Continuous scraper for NOF1.AI ModelChat data"""
     
-    def __init__(self, db_path: str = "nof1_data.db", check_interval: int = 150):
+    # Requests aborted before they leave the browser: none of them carry chat
+    # text. Stylesheets still load, since inner_text depends on layout.
+    BLOCKED_RESOURCE_TYPES = {'image', 'font', 'media'}
+    BLOCKED_URL_RE = re.compile(
+        r'googletagmanager|google-analytics|segment\.(?:io|com)|hotjar|sentry\.io'
+    )
+    
+    # Candidate chat message selectors, most specific first; the first one
+    # with any matches is used
+    MESSAGE_SELECTORS = [
+        '.model-chat-message',
+        '[data-testid="chat-message"]',
+        '.chat-message',
+        '[class*="message"]'
+    ]
+    # Runs in the page: tries MESSAGE_SELECTORS in order and returns the
+    # first match's selector and texts, so the lookup and every innerText
+    # read share a single round trip
+    MESSAGE_TEXTS_JS = '''
+        (selectors) => {
+            for (const selector of selectors) {
+                const elements = document.querySelectorAll(selector);
+                if (elements.length) {
+                    return {selector, texts: Array.from(elements, e => e.innerText)};
+                }
+            }
+            return null;
+        }
+    '''
+    
+    # Connection pragmas; WAL itself persists in the database file
+    PRAGMA_SQL = '''
+        PRAGMA journal_mode = WAL;
+        PRAGMA synchronous = NORMAL;
+        PRAGMA temp_store = MEMORY;
+        PRAGMA cache_size = -65536;
+        PRAGMA mmap_size = 268435456;
+    '''
+    
+    # Duplicates (same message_hash) are dropped by the UNIQUE constraints
+    INSERT_SQL = '''
+        INSERT OR IGNORE INTO model_chat 
+        (model_name, timestamp, message_hash, reasoning, action, 
+         confidence, positions, market_data, raw_content, scraped_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    '''
+    
+    def __init__(self, db_path: str = "nof1_data.db", check_interval: int = 150,
+                 concurrency: int = 4):
         """
         Initialize scraper
         
         Args:
             db_path: Path to SQLite database
             check_interval: Seconds between checks (default 150 = 2.5 minutes)
+            concurrency: Model pages loaded at the same time (default 4)
         """
         self.db_path = db_path
         self.check_interval = check_interval
+        self.concurrency = concurrency
+        
+        # One connection for the scraper's lifetime instead of one per message
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.executescript(self.PRAGMA_SQL)
         self.init_database()
         
+        # Hashes already in model_chat. Nearly every message seen in a cycle
+        # was saved by an earlier one, and this set turns those away without
+        # a round trip; the UNIQUE constraints stay the authoritative check
+        self.known_hashes = {
+            message_hash for (message_hash,) in
+            self.conn.execute('SELECT message_hash FROM model_chat')
+        }
+        
         # Model URLs to scrape
         self.models = {
             'deepseek-v3.1': 'https://nof1.ai/models/deepseek-chat-v3.1',
@@ -61,8 +132,7 @@ class NOF1Scraper:
         
     def init_database(self):
         """Create SQLite database schema"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self.conn.cursor()
         
         # Main messages table
         cursor.execute('''
@@ -95,108 +165,138 @@ class NOF1Scraper:
         
         # Create indexes
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_model_time ON model_chat(model_name, timestamp)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_hash ON model_chat(message_hash)')
+        # scraped_at indexes serve the stats ranges and the export ordering,
+        # and the read-only monitor's window queries; same names as the
+        # analyzer creates
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_model_scraped ON model_chat(model_name, scraped_at)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_scraped ON model_chat(scraped_at)')
+        # No idx_hash here: message_hash UNIQUE already has an automatic
+        # index. The collector, which shares this database, creates idx_hash
+        # itself, so it is left alone rather than dropped
         
-        conn.commit()
-        conn.close()
+        self.conn.commit()
         logger.info(f"✓ Database initialized: {self.db_path}")
     
     def hash_message(self, content: str) -> str:
         """Create hash for duplicate detection"""
-        return hashlib.sha256(content.encode()).hexdigest()[:16]
+        return content_hash(content)
     
-    def message_exists(self, message_hash: str) -> bool:
-        """Check if message already scraped"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('SELECT 1 FROM model_chat WHERE message_hash = ?', (message_hash,))
-        exists = cursor.fetchone() is not None
-        conn.close()
-        return exists
+    def message_row(self, model_name: str, data: Dict, message_hash: str,
+                    scraped_at: Optional[str] = None) -> tuple:
+        """Parameters for INSERT_SQL from one scraped message
+        
+        scraped_at defaults to now; a cycle passes its own start time so every
+        row it saves shares one formatted timestamp.
+        """
+        scraped_at = scraped_at or datetime.now().isoformat()
+        return (
+            model_name,
+            data.get('timestamp', scraped_at),
+            message_hash,
+            data.get('reasoning'),
+            data.get('action'),
+            data.get('confidence'),
+            json.dumps(data.get('positions', [])),
+            json.dumps(data.get('market_data', {})),
+            data['raw_content'],
+            scraped_at
+        )
     
-    def save_message(self, model_name: str, data: Dict):
-        """Save message to database if new"""
-        message_hash = self.hash_message(data['raw_content'])
+    def pending_rows(self, model_name: str, messages: List[Dict],
+                     pending_hashes: set, scraped_at: Optional[str] = None) -> List[tuple]:
+        """Rows for messages neither saved nor already pending
         
-        if self.message_exists(message_hash):
-            return False  # Already exists
+        pending_hashes collects the hashes of the returned rows, so a message
+        seen twice before the next insert_rows is only queued once.
+        """
+        rows = []
+        for data in messages:
+            message_hash = self.hash_message(data['raw_content'])
+            if message_hash not in self.known_hashes and message_hash not in pending_hashes:
+                pending_hashes.add(message_hash)
+                rows.append(self.message_row(model_name, data, message_hash, scraped_at))
+        return rows
+    
+    def insert_rows(self, rows: List[tuple]) -> int:
+        """Insert pending rows in one transaction; returns how many were new"""
+        if not rows:
+            return 0
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        before = self.conn.total_changes
+        with self.conn:
+            self.conn.executemany(self.INSERT_SQL, rows)
+        self.known_hashes.update(row[2] for row in rows)
+        return self.conn.total_changes - before
+    
+    def save_messages(self, model_name: str, messages: List[Dict]) -> int:
+        """Save new messages in one transaction; returns how many were new"""
+        return self.insert_rows(self.pending_rows(model_name, messages, set()))
+    
+    def save_message(self, model_name: str, data: Dict) -> bool:
+        """Save message to database if new"""
+        message_hash = self.hash_message(data['raw_content'])
+        if message_hash in self.known_hashes:
+            return False
         
-        try:
-            cursor.execute('''
-                INSERT INTO model_chat 
-                (model_name, timestamp, message_hash, reasoning, action, 
-                 confidence, positions, market_data, raw_content, scraped_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                model_name,
-                data.get('timestamp', datetime.now().isoformat()),
-                message_hash,
-                data.get('reasoning'),
-                data.get('action'),
-                data.get('confidence'),
-                json.dumps(data.get('positions', [])),
-                json.dumps(data.get('market_data', {})),
-                data['raw_content'],
-                datetime.now().isoformat()
-            ))
-            conn.commit()
-            conn.close()
-            return True  # New message saved
-        except sqlite3.IntegrityError:
-            conn.close()
-            return False  # Duplicate
+        # RETURNING yields a row only if the insert wasn't ignored, so one
+        # statement both dedups and reports the outcome
+        with self.conn:
+            cursor = self.conn.execute(
+                self.INSERT_SQL + ' RETURNING id',
+                self.message_row(model_name, data, message_hash)
+            )
+            inserted = cursor.fetchone() is not None
+        self.known_hashes.add(message_hash)
+        return inserted
     
-    def scrape_model_page(self, model_name: str, url: str, page) -> List[Dict]:
-        """Scrape ModelChat from a single model page"""
+    async def scrape_model_page(self, model_name: str, url: str, page,
+                                timestamp: Optional[str] = None) -> List[Dict]:
+        """Scrape ModelChat from a single model page
+        
+        Every message is stamped with timestamp, by default the time the page
+        is scraped.
+        """
+        timestamp = timestamp or datetime.now().isoformat()
         try:
             logger.info(f"  → Navigating to {model_name}...")
-            page.goto(url, wait_until='networkidle', timeout=30000)
+            # Trackers are blocked, but the page may still poll; the chat
+            # container appearing, not network idle, is the readiness signal
+            await page.goto(url, wait_until='domcontentloaded', timeout=15000)
             
             # Wait for chat container to load
-            page.wait_for_selector('[class*="chat"]', timeout=10000)
+            await page.wait_for_selector('[class*="chat"]', timeout=10000)
             
             # Extract all chat messages
             # Note: Actual selectors need to be updated based on real DOM structure
             messages = []
             
             # Try different possible selectors for chat messages
-            selectors = [
-                '.model-chat-message',
-                '[data-testid="chat-message"]',
-                '.chat-message',
-                '[class*="message"]'
-            ]
+            try:
+                found = await page.evaluate(self.MESSAGE_TEXTS_JS, self.MESSAGE_SELECTORS)
+            except Exception as e:
+                found = None
             
-            for selector in selectors:
-                try:
-                    elements = page.query_selector_all(selector)
-                    if elements:
-                        logger.info(f"    Found {len(elements)} messages with selector: {selector}")
-                        for elem in elements:
-                            text = elem.inner_text()
-                            if text.strip():
-                                messages.append({
-                                    'raw_content': text,
-                                    'timestamp': datetime.now().isoformat(),
-                                    'reasoning': text  # Parse this more intelligently later
-                                })
-                        break
-                except Exception as e:
-                    continue
+            if found:
+                logger.info(f"    Found {len(found['texts'])} messages with selector: {found['selector']}")
+                messages = [
+                    {
+                        'raw_content': text,
+                        'timestamp': timestamp,
+                        'reasoning': text  # Parse this more intelligently later
+                    }
+                    for text in found['texts'] if text.strip()
+                ]
             
             if not messages:
                 # Fallback: grab all visible text in main content area
                 logger.warning(f"    No messages found with standard selectors, trying fallback...")
                 try:
-                    main_content = page.query_selector('main') or page.query_selector('body')
+                    main_content = await page.query_selector('main') or await page.query_selector('body')
                     if main_content:
-                        text = main_content.inner_text()
+                        text = await main_content.inner_text()
                         # Split by common delimiters
                         chunks = [t.strip() for t in text.split('\n\n') if len(t.strip()) > 50]
-                        messages = [{'raw_content': chunk, 'timestamp': datetime.now().isoformat()} 
+                        messages = [{'raw_content': chunk, 'timestamp': timestamp} 
                                    for chunk in chunks[:10]]  # Limit to recent
                 except Exception as e:
                     logger.error(f"    Fallback extraction failed: {e}")
@@ -210,43 +310,75 @@ class NOF1Scraper:
             logger.error(f"  ✗ Error scraping {model_name}: {e}")
             return []
     
-    def run_scrape_cycle(self, playwright):
-        """Run one complete scrape cycle for all models"""
+    async def scrape_model(self, context, semaphore: asyncio.Semaphore,
+                           model_name: str, url: str, timestamp: str) -> List[Dict]:
+        """Scrape one model on its own page"""
+        async with semaphore:
+            page = await context.new_page()
+            try:
+                return await self.scrape_model_page(model_name, url, page, timestamp)
+            finally:
+                await page.close()
+    
+    async def launch_browser(self, playwright):
+        """Launch the browser and the context every cycle's pages open in"""
+        browser = await playwright.chromium.launch(headless=True)
+        context = await browser.new_context(
+            viewport={'width': 1920, 'height': 1080},
+            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+        )
+        await context.route('**/*', self.block_heavy_requests)
+        return browser, context
+    
+    async def block_heavy_requests(self, route):
+        """Route handler: abort media and tracker requests, pass the rest"""
+        request = route.request
+        if (request.resource_type in self.BLOCKED_RESOURCE_TYPES
+                or self.BLOCKED_URL_RE.search(request.url)):
+            await route.abort()
+        else:
+            await route.continue_()
+    
+    async def run_scrape_cycle(self, context):
+        """Run one complete scrape cycle for all models
+        
+        Model pages load concurrently, up to self.concurrency at a time, so a
+        slow page no longer holds up the rest of the cycle. Only pages are
+        opened and closed here; the browser context outlives the cycle.
+        New messages from every model are saved together in one transaction,
+        all stamped with the cycle's start time.
+        """
         logger.info("=" * 60)
         logger.info("🔄 Starting scrape cycle...")
         
-        browser = playwright.chromium.launch(headless=True)
-        context = browser.new_context(
-            viewport={'width': 1920, 'height': 1080},
-            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+        cycle_time = datetime.now().isoformat()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        results = await asyncio.gather(
+            *(self.scrape_model(context, semaphore, model_name, url, cycle_time)
+              for model_name, url in self.models.items()),
+            return_exceptions=True
         )
-        page = context.new_page()
         
-        new_messages_total = 0
+        rows = []
+        pending_hashes = set()
         errors = []
         
-        for model_name, url in self.models.items():
-            try:
-                messages = self.scrape_model_page(model_name, url, page)
-                new_count = 0
-                
-                for msg in messages:
-                    if self.save_message(model_name, msg):
-                        new_count += 1
-                
-                if new_count > 0:
-                    logger.info(f"  ✓ {model_name}: {new_count} new messages")
-                else:
-                    logger.info(f"  ○ {model_name}: No new messages")
-                
-                new_messages_total += new_count
-                
-            except Exception as e:
-                error_msg = f"{model_name}: {str(e)}"
+        for model_name, result in zip(self.models, results):
+            if isinstance(result, Exception):
+                error_msg = f"{model_name}: {str(result)}"
                 errors.append(error_msg)
                 logger.error(f"  ✗ {error_msg}")
+                continue
+            
+            new_rows = self.pending_rows(model_name, result, pending_hashes, cycle_time)
+            rows.extend(new_rows)
+            
+            if new_rows:
+                logger.info(f"  ✓ {model_name}: {len(new_rows)} new messages")
+            else:
+                logger.info(f"  ○ {model_name}: No new messages")
         
-        browser.close()
+        new_messages_total = self.insert_rows(rows)
         
         # Log scraper run
         self.log_scraper_run(len(self.models), new_messages_total, errors)
@@ -256,8 +388,7 @@ class NOF1Scraper:
     
     def log_scraper_run(self, models_checked: int, new_messages: int, errors: List[str]):
         """Log scraper run to database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self.conn.cursor()
         cursor.execute('''
             INSERT INTO scraper_runs (run_timestamp, models_checked, new_messages, errors)
             VALUES (?, ?, ?, ?)
@@ -267,8 +398,7 @@ class NOF1Scraper:
             new_messages,
             json.dumps(errors) if errors else None
         ))
-        conn.commit()
-        conn.close()
+        self.conn.commit()
     
     def run_continuous(self):
         """Main loop - run scraper continuously"""
@@ -281,75 +411,93 @@ class NOF1Scraper:
         logger.info(f"   Database: {self.db_path}")
         logger.info(f"   Check interval: {self.check_interval}s ({self.check_interval/60:.1f} min)")
         logger.info(f"   Models: {', '.join(self.models.keys())}")
+        logger.info(f"   Concurrency: {self.concurrency}")
         logger.info("   Press Ctrl+C to stop")
         logger.info("")
         
+        try:
+            asyncio.run(self.run_cycles())
+        except KeyboardInterrupt:
+            logger.info("\n⏹️  Scraper stopped by user")
+    
+    async def run_cycles(self):
+        """Scrape cycles forever on one browser launched up front
+        
+        Chromium starts once instead of once per cycle; it is relaunched only
+        if it disconnects, and closed when the loop exits (e.g. on Ctrl+C).
+        """
         cycle_count = 0
         
-        with sync_playwright() as playwright:
-            while True:
-                try:
-                    cycle_count += 1
-                    logger.info(f"Cycle #{cycle_count}")
-                    
-                    self.run_scrape_cycle(playwright)
-                    
-                    logger.info(f"😴 Sleeping for {self.check_interval}s...")
-                    logger.info("")
-                    time.sleep(self.check_interval)
-                    
-                except KeyboardInterrupt:
-                    logger.info("\n⏹️  Scraper stopped by user")
-                    break
-                except Exception as e:
-                    logger.error(f"❌ Unexpected error in main loop: {e}")
-                    logger.info("   Waiting 60s before retry...")
-                    time.sleep(60)
+        async with async_playwright() as playwright:
+            browser, context = await self.launch_browser(playwright)
+            try:
+                while True:
+                    try:
+                        cycle_count += 1
+                        logger.info(f"Cycle #{cycle_count}")
+                        
+                        if not browser.is_connected():
+                            logger.warning("   Browser disconnected, relaunching...")
+                            browser, context = await self.launch_browser(playwright)
+                        
+                        await self.run_scrape_cycle(context)
+                        
+                        logger.info(f"😴 Sleeping for {self.check_interval}s...")
+                        logger.info("")
+                        await asyncio.sleep(self.check_interval)
+                        
+                    except Exception as e:
+                        logger.error(f"❌ Unexpected error in main loop: {e}")
+                        logger.info("   Waiting 60s before retry...")
+                        await asyncio.sleep(60)
+            finally:
+                await browser.close()
     
     def export_to_csv(self, output_file: str = "nof1_data.csv"):
         """Export all scraped data to CSV"""
         import csv
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        exported = self.conn.execute('SELECT COUNT(*) FROM model_chat').fetchone()[0]
+        
+        cursor = self.conn.cursor()
         cursor.execute('SELECT * FROM model_chat ORDER BY scraped_at DESC')
         
-        rows = cursor.fetchall()
         columns = [desc[0] for desc in cursor.description]
         
-        with open(output_file, 'w', newline='', encoding='utf-8') as f:
+        # Rows stream from the cursor straight into a 1 MB write buffer, so
+        # the table is never held in memory at once
+        with open(output_file, 'w', newline='', encoding='utf-8', buffering=1 << 20) as f:
             writer = csv.writer(f)
             writer.writerow(columns)
-            writer.writerows(rows)
+            writer.writerows(cursor)
         
-        conn.close()
-        logger.info(f"✓ Exported {len(rows)} messages to {output_file}")
+        logger.info(f"✓ Exported {exported} messages to {output_file}")
+    
+    def close(self):
+        """Close the database connection"""
+        self.conn.close()
     
     def get_stats(self) -> Dict:
         """Get scraping statistics"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT COUNT(*) FROM model_chat')
-        total_messages = cursor.fetchone()[0]
+        cursor = self.conn.cursor()
         
-        cursor.execute('SELECT model_name, COUNT(*) FROM model_chat GROUP BY model_name')
-        by_model = dict(cursor.fetchall())
+        # One walk of idx_model_scraped gives each model's count and range;
+        # the overall figures follow from those
+        cursor.execute('''
+            SELECT model_name, COUNT(*), MIN(scraped_at), MAX(scraped_at)
+            FROM model_chat GROUP BY model_name
+        ''')
+        per_model = cursor.fetchall()
         
         cursor.execute('SELECT COUNT(*) FROM scraper_runs')
         total_runs = cursor.fetchone()[0]
         
-        cursor.execute('SELECT MIN(scraped_at), MAX(scraped_at) FROM model_chat')
-        date_range = cursor.fetchone()
-        
-        conn.close()
-        
         return {
-            'total_messages': total_messages,
-            'by_model': by_model,
+            'total_messages': sum(row[1] for row in per_model),
+            'by_model': {row[0]: row[1] for row in per_model},
             'total_scraper_runs': total_runs,
-            'first_message': date_range[0],
-            'last_message': date_range[1]
+            'first_message': min((row[2] for row in per_model), default=None),
+            'last_message': max((row[3] for row in per_model), default=None)
         }
 
 
@@ -361,6 +509,8 @@ def main():
     parser.add_argument('--db', default='nof1_data.db', help='Database file path')
     parser.add_argument('--interval', type=int, default=150, 
                        help='Check interval in seconds (default: 150 = 2.5 min)')
+    parser.add_argument('--concurrency', type=int, default=4,
+                       help='Model pages to load at the same time (default: 4)')
     parser.add_argument('--export', action='store_true', 
                        help='Export database to CSV and exit')
     parser.add_argument('--stats', action='store_true', 
@@ -368,7 +518,8 @@ def main():
     
     args = parser.parse_args()
     
-    scraper = NOF1Scraper(db_path=args.db, check_interval=args.interval)
+    scraper = NOF1Scraper(db_path=args.db, check_interval=args.interval,
+                          concurrency=args.concurrency)
     
     if args.export:
         scraper.export_to_csv()
@@ -386,6 +537,8 @@ def main():
         print(f"  Last:  {stats['last_message']}")
     else:
         scraper.run_continuous()
+    
+    scraper.close()
 
 
 if __name__ == '__main__':
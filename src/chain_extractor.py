@@ -2,18 +2,76 @@
 
 import re
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, Union
 from rich.console import Console
 
 from .models import ModelMessage, TradingDecision
 
 console = Console()
 
+# Patterns are compiled once at import rather than on every extraction
+
+# Common model names, in priority order, with their display form
+MODEL_NAMES = {
+    name: name.title()
+    for name in (
+        "CLAUDE SONNET 4.5",
+        "DEEPSEEK CHAT V3.1",
+        "GEMINI 2.5 PRO",
+        "GPT 5",
+        "GROK 4",
+        "QWEN3 MAX",
+    )
+}
+
+# All model names in one alternation, so the text is scanned once
+MODEL_NAME_RE = re.compile("|".join(map(re.escape, MODEL_NAMES)), re.IGNORECASE)
+
+# Timestamp pattern: "10/29 07:57:57"
+TIMESTAMP_RE = re.compile(r"(\d{1,2})/(\d{1,2})\s+(\d{2}):(\d{2}):(\d{2})")
+
+# Message header: a model name, then the timestamp. Both normally sit at the
+# top of the snapshot, so only its first HEADER_SCAN_CHARS are searched
+# first; snapshots laid out otherwise fall back to MODEL_NAME_RE and
+# TIMESTAMP_RE over the whole text
+HEADER_RE = re.compile(
+    rf"(?P<model>{MODEL_NAME_RE.pattern}).*?{TIMESTAMP_RE.pattern}",
+    re.IGNORECASE | re.DOTALL,
+)
+HEADER_SCAN_CHARS = 4096
+
+# Decision blocks: Symbol, Action, Confidence, Quantity
+DECISION_RE = re.compile(r"([A-Z]+)\s+(HOLD|BUY|SELL)\s+(\d+)%\s+QUANTITY:\s+([\d.]+)")
+
+ACCOUNT_VALUE_RE = re.compile(r"Current Account Value:\s*([\d,.]+)")
+TOTAL_RETURN_RE = re.compile(r"Current Total Return.*?:\s*([-+]?[\d.]+)%")
+SHARPE_RATIO_RE = re.compile(r"Sharpe Ratio:\s*([-+]?[\d.]+)")
+
+COIN_SYMBOLS = ["BTC", "ETH", "SOL", "BNB", "XRP", "DOGE"]
+
+# Coin section boundaries: a section runs from "ALL BTC DATA" up to the
+# next boundary
+COIN_BOUNDARY_RE = re.compile(r"ALL ([A-Z]+) DATA|HERE IS YOUR ACCOUNT")
+
+# Key metrics within a coin section, one named group each. The alternation
+# sits in a lookahead so matches never consume text: each metric's first
+# occurrence is found exactly as a separate search for it would find it.
+COIN_METRICS = ["current_price", "current_macd", "current_rsi"]
+COIN_METRICS_RE = re.compile(
+    r"(?=current_price\s*=\s*(?P<current_price>[\d.]+)"
+    r"|current_macd\s*=\s*(?P<current_macd>[-\d.]+)"
+    r"|current_rsi.*?=\s*(?P<current_rsi>[\d.]+))"
+)
+
+# Snapshot sections run from their name up to the next "▶" marker
+SECTION_NAMES = ["USER_PROMPT", "CHAIN_OF_THOUGHT", "TRADING_DECISIONS"]
+SECTION_BOUNDARY_RE = re.compile("|".join(SECTION_NAMES) + "|▶")
+
 
 class ChainExtractor:
     """Extracts chain of thought data from nof1.ai message elements"""
 
-    def extract_from_snapshot(self, snapshot_data: Dict[str, Any]) -> Optional[ModelMessage]:
+    def extract_from_snapshot(self, snapshot_data: Union[Dict[str, Any], str]) -> Optional[ModelMessage]:
         """
         Extract message data from Playwright browser snapshot
 
@@ -24,24 +82,28 @@ class ChainExtractor:
         - TRADING_DECISIONS section (expandable)
 
         Args:
-            snapshot_data: Data structure from the expanded message
+            snapshot_data: Data structure from the expanded message, or its
+                text if already flattened
 
         Returns:
             ModelMessage if extraction successful, None otherwise
         """
         try:
+            # Flatten the snapshot once; every extractor searches this text
+            text = snapshot_data if isinstance(snapshot_data, str) else str(snapshot_data)
+
             # Extract model name and timestamp from header
-            model_name = self._extract_model_name(snapshot_data)
-            timestamp = self._extract_timestamp(snapshot_data)
+            model_name, timestamp = self._extract_header(text)
 
             if not model_name or not timestamp:
                 console.print("[yellow]Could not extract model name or timestamp[/yellow]")
                 return None
 
             # Extract sections
-            user_prompt = self._extract_section(snapshot_data, "USER_PROMPT")
-            chain_of_thought = self._extract_section(snapshot_data, "CHAIN_OF_THOUGHT")
-            trading_decisions_text = self._extract_section(snapshot_data, "TRADING_DECISIONS")
+            sections = self._split_sections(text)
+            user_prompt = sections.get("USER_PROMPT", "")
+            chain_of_thought = sections.get("CHAIN_OF_THOUGHT", "")
+            trading_decisions_text = sections.get("TRADING_DECISIONS", "")
 
             if not chain_of_thought:
                 console.print("[yellow]Could not extract chain of thought[/yellow]")
@@ -74,70 +136,66 @@ class ChainExtractor:
             console.print(f"[red]Error extracting message: {e}[/red]")
             return None
 
-    def _extract_model_name(self, snapshot_data: Dict[str, Any]) -> Optional[str]:
-        """Extract model name from snapshot header"""
-        # Model name is typically in a heading element
-        # Look for patterns like "CLAUDE SONNET 4.5", "GPT 5", etc.
-        text = str(snapshot_data)
-
-        # Common model name patterns
-        model_patterns = [
-            r"CLAUDE SONNET 4\.5",
-            r"DEEPSEEK CHAT V3\.1",
-            r"GEMINI 2\.5 PRO",
-            r"GPT 5",
-            r"GROK 4",
-            r"QWEN3 MAX",
-        ]
-
-        for pattern in model_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                return match.group(0).title()
-
-        return None
-
-    def _extract_timestamp(self, snapshot_data: Dict[str, Any]) -> Optional[datetime]:
-        """Extract timestamp from snapshot"""
-        text = str(snapshot_data)
-
-        # Look for timestamp pattern: "10/29 07:57:57"
-        timestamp_pattern = r"(\d{1,2})/(\d{1,2})\s+(\d{2}):(\d{2}):(\d{2})"
-        match = re.search(timestamp_pattern, text)
+    def _extract_header(self, text: str) -> Tuple[Optional[str], Optional[datetime]]:
+        """Extract model name and timestamp from snapshot header"""
+        # Model name is typically in a heading element, followed by the
+        # timestamp: "CLAUDE SONNET 4.5 ... 10/29 07:57:57"
+        match = HEADER_RE.search(text, 0, HEADER_SCAN_CHARS)
 
         if match:
-            month, day, hour, minute, second = map(int, match.groups())
-            # Assume current year
-            year = datetime.now().year
+            model_name = MODEL_NAMES[match.group("model").upper()]
+            timestamp_fields = match.groups()[1:]
+        else:
+            # Long preamble or reordered snapshot: find each one anywhere.
+            # The earliest name in MODEL_NAMES present in the text wins
+            found = {name.upper() for name in MODEL_NAME_RE.findall(text)}
+            model_name = next(
+                (display for name, display in MODEL_NAMES.items() if name in found),
+                None,
+            )
+            timestamp_match = TIMESTAMP_RE.search(text)
+            timestamp_fields = timestamp_match.groups() if timestamp_match else None
+
+        if timestamp_fields is None:
+            return model_name, None
 
-            return datetime(year, month, day, hour, minute, second)
+        month, day, hour, minute, second = map(int, timestamp_fields)
+        # Assume current year
+        year = datetime.now().year
 
-        return None
+        return model_name, datetime(year, month, day, hour, minute, second)
 
-    def _extract_section(self, snapshot_data: Dict[str, Any], section_name: str) -> str:
+    def _split_sections(self, text: str) -> Dict[str, str]:
         """
-        Extract a specific section from the snapshot
+        Split the snapshot into its sections in one linear scan
 
         Args:
-            snapshot_data: The snapshot data structure
-            section_name: Name of section (USER_PROMPT, CHAIN_OF_THOUGHT, TRADING_DECISIONS)
+            text: The flattened snapshot text
 
         Returns:
-            Extracted text content
+            Dict of section name (USER_PROMPT, CHAIN_OF_THOUGHT,
+            TRADING_DECISIONS) to extracted text content; sections not
+            found are absent
         """
-        text = str(snapshot_data)
-
-        # Find the section header and extract content until next section
-        section_pattern = rf"{section_name}.*?(?=▶|$)"
-        match = re.search(section_pattern, text, re.DOTALL)
-
-        if match:
-            content = match.group(0)
-            # Clean up the content
-            content = re.sub(r"▶\s*" + section_name, "", content)
-            return content.strip()
-
-        return ""
+        sections = {}
+        # Sections whose first mention has been seen but not yet closed
+        open_starts = {}
+
+        # Each section starts at the first mention of its name and runs
+        # until the next section marker
+        for match in SECTION_BOUNDARY_RE.finditer(text):
+            name = match.group(0)
+            if name == "▶":
+                for open_name, start in open_starts.items():
+                    sections[open_name] = text[start:match.start()].strip()
+                open_starts.clear()
+            elif name not in sections and name not in open_starts:
+                open_starts[name] = match.start()
+
+        for open_name, start in open_starts.items():
+            sections[open_name] = text[start:].strip()
+
+        return sections
 
     def _parse_trading_decisions(self, decisions_text: str) -> List[TradingDecision]:
         """
@@ -149,25 +207,16 @@ class ChainExtractor:
         65%
         QUANTITY: 25.7
         """
-        decisions = []
-
-        # Pattern to match decision blocks
         # Looking for: Symbol, Action, Confidence, Quantity
-        pattern = r"([A-Z]+)\s+(HOLD|BUY|SELL)\s+(\d+)%\s+QUANTITY:\s+([\d.]+)"
-
-        for match in re.finditer(pattern, decisions_text):
-            symbol, action, confidence, quantity = match.groups()
-
-            decisions.append(
-                TradingDecision(
-                    symbol=symbol,
-                    action=action,
-                    confidence=float(confidence) / 100.0,
-                    quantity=float(quantity) if quantity else None,
-                )
+        return [
+            TradingDecision(
+                symbol=symbol,
+                action=action,
+                confidence=float(confidence) / 100.0,
+                quantity=float(quantity),
             )
-
-        return decisions
+            for symbol, action, confidence, quantity in DECISION_RE.findall(decisions_text)
+        ]
 
     def _extract_account_metrics(self, user_prompt: str) -> tuple[Optional[float], Optional[float], Optional[float]]:
         """
@@ -183,17 +232,17 @@ class ChainExtractor:
         sharpe_ratio = None
 
         # Extract account value
-        value_match = re.search(r"Current Account Value:\s*([\d,.]+)", user_prompt)
+        value_match = ACCOUNT_VALUE_RE.search(user_prompt)
         if value_match:
             account_value = float(value_match.group(1).replace(",", ""))
 
         # Extract total return
-        return_match = re.search(r"Current Total Return.*?:\s*([-+]?[\d.]+)%", user_prompt)
+        return_match = TOTAL_RETURN_RE.search(user_prompt)
         if return_match:
             total_return = float(return_match.group(1))
 
         # Extract sharpe ratio
-        sharpe_match = re.search(r"Sharpe Ratio:\s*([-+]?[\d.]+)", user_prompt)
+        sharpe_match = SHARPE_RATIO_RE.search(user_prompt)
         if sharpe_match:
             sharpe_ratio = float(sharpe_match.group(1))
 
@@ -207,36 +256,29 @@ class ChainExtractor:
         """
         market_data = {}
 
-        # Extract data for each coin
-        coin_symbols = ["BTC", "ETH", "SOL", "BNB", "XRP", "DOGE"]
-
-        for symbol in coin_symbols:
-            # Look for section headers like "ALL BTC DATA"
-            section_pattern = rf"ALL {symbol} DATA.*?(?=ALL [A-Z]+ DATA|HERE IS YOUR ACCOUNT|$)"
-            match = re.search(section_pattern, user_prompt, re.DOTALL)
-
-            if match:
-                section_text = match.group(0)
+        # Look for section headers like "ALL BTC DATA"; the first section per
+        # coin counts, and each runs until the next boundary
+        sections = {}
+        boundaries = list(COIN_BOUNDARY_RE.finditer(user_prompt))
+        ends = [match.start() for match in boundaries[1:]] + [len(user_prompt)]
+        for match, end in zip(boundaries, ends):
+            symbol = match.group(1)
+            if symbol in COIN_SYMBOLS and symbol not in sections:
+                sections[symbol] = user_prompt[match.start():end]
 
-                # Extract key metrics
-                coin_data = {}
-
-                # Current price
-                price_match = re.search(r"current_price\s*=\s*([\d.]+)", section_text)
-                if price_match:
-                    coin_data["current_price"] = float(price_match.group(1))
+        # Extract data for each coin
+        for symbol in COIN_SYMBOLS:
+            if symbol not in sections:
+                continue
 
-                # MACD
-                macd_match = re.search(r"current_macd\s*=\s*([-\d.]+)", section_text)
-                if macd_match:
-                    coin_data["current_macd"] = float(macd_match.group(1))
+            # Extract key metrics, keeping the first value of each
+            found = {}
+            for match in COIN_METRICS_RE.finditer(sections[symbol]):
+                found.setdefault(match.lastgroup, match.group(match.lastgroup))
 
-                # RSI
-                rsi_match = re.search(r"current_rsi.*?=\s*([\d.]+)", section_text)
-                if rsi_match:
-                    coin_data["current_rsi"] = float(rsi_match.group(1))
+            coin_data = {metric: float(found[metric]) for metric in COIN_METRICS if metric in found}
 
-                if coin_data:
-                    market_data[symbol] = coin_data
+            if coin_data:
+                market_data[symbol] = coin_data
 
         return market_data
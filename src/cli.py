@@ -2,21 +2,64 @@
 Command-line interface for nof1.ai scraper
 """
 
-import json
+import inspect
+import re
+import sys
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 import typer
-from rich.console import Console
-from rich.panel import Panel
-from rich import print as rprint
 
-from .scraper import Nof1Scraper, ScrapeSession
-from .storage import StorageManager
+from . import __version__
+
+# Rich, the scraper and storage are imported inside the commands that use
+# them, so --help and light commands don't pay for loading them
 
 app = typer.Typer(
     help="nof1.ai Chain of Thought Scraper - Extract reasoning from AI trading models"
 )
-console = Console()
+
+
+@lru_cache(maxsize=1)
+def _console():
+    """Shared Rich console, created on first use"""
+    from rich.console import Console
+
+    return Console()
+
+
+def fast_path(app: typer.Typer, prog: str, argv: List[str]) -> bool:
+    """
+    Answer --version and a bare --help without building Typer's parser
+
+    Args:
+        app: The Typer app whose commands are listed
+        prog: Program name shown in the usage line
+        argv: Command-line arguments, without the program name
+
+    Returns:
+        True if argv was handled here; anything else, including per-command
+        help, is left to Typer
+    """
+    if len(argv) != 1:
+        return False
+
+    if argv[0] in ("-v", "--version"):
+        print(__version__)
+        return True
+
+    if argv[0] in ("-h", "--help"):
+        print(f"Usage: {prog} [OPTIONS] COMMAND [ARGS]...\n")
+        print(f"{app.info.help}\n")
+        print("Commands:")
+        for command in app.registered_commands:
+            name = command.name or command.callback.__name__.replace("_", "-")
+            summary = inspect.cleandoc(command.callback.__doc__ or "").split("\n")[0]
+            print(f"  {name:<26} {summary}")
+        print(f"\nRun '{prog} COMMAND --help' for a command's options.")
+        return True
+
+    return False
 
 
 @app.command()
@@ -34,6 +77,10 @@ def guide(
     This displays step-by-step instructions for using MCP Playwright tools
     to scrape nof1.ai within Claude Code.
     """
+    import json
+    from .scraper import Nof1Scraper
+
+    console = _console()
     scraper = Nof1Scraper(
         data_dir=data_dir,
         max_messages=max_messages,
@@ -72,6 +119,10 @@ def plan(
     This generates a detailed plan that can be saved and used for
     automated scraping.
     """
+    import json
+    from rich import print as rprint
+    from .scraper import Nof1Scraper
+
     scraper = Nof1Scraper(
         data_dir=data_dir,
         max_messages=max_messages,
@@ -83,7 +134,7 @@ def plan(
     if output:
         with open(output, "w") as f:
             json.dump(plan, f, indent=2)
-        console.print(f"[green]✓ Plan saved to {output}[/green]")
+        _console().print(f"[green]✓ Plan saved to {output}[/green]")
     else:
         rprint(plan)
 
@@ -100,6 +151,10 @@ def stats(
 
     Displays information about stored messages, models, and time ranges.
     """
+    from rich.panel import Panel
+    from .storage import StorageManager
+
+    console = _console()
     storage = StorageManager(data_dir)
 
     stats = storage.get_storage_stats()
@@ -144,6 +199,9 @@ def search(
     Performs a simple text search through locally stored messages.
     For semantic search, use OpenMemory queries.
     """
+    from .storage import StorageManager
+
+    console = _console()
     storage = StorageManager(data_dir)
 
     messages = storage.load_messages(model_name=model)
@@ -152,22 +210,23 @@ def search(
         console.print("[yellow]No messages found[/yellow]")
         return
 
-    # Simple text search
-    query_lower = query.lower()
+    # Simple text search; a case-insensitive pattern avoids lowercasing
+    # every chain of thought, and the match position is kept for the snippet
+    pattern = re.compile(re.escape(query), re.IGNORECASE)
     results = []
 
     for msg in messages:
-        if query_lower in msg.chain_of_thought.lower():
-            results.append(msg)
+        match = pattern.search(msg.chain_of_thought)
+        if match:
+            results.append((msg, match.start()))
 
     console.print(f"\nFound {len(results)} results for '{query}'\n")
 
-    for i, msg in enumerate(results[:limit], 1):
+    for i, (msg, idx) in enumerate(results[:limit], 1):
         console.print(f"[bold cyan]{i}. {msg.model_name}[/bold cyan] - {msg.timestamp}")
         console.print(f"Return: {msg.total_return:+.2f}% | Value: ${msg.account_value:,.2f}")
 
         # Show snippet
-        idx = msg.chain_of_thought.lower().find(query_lower)
         start = max(0, idx - 50)
         end = min(len(msg.chain_of_thought), idx + 100)
         snippet = msg.chain_of_thought[start:end].strip()
@@ -187,7 +246,7 @@ def init(
 
     Creates the necessary directory structure for the scraper.
     """
-    data_dir = Path(data_dir)
+    console = _console()
     raw_dir = data_dir / "raw"
     processed_dir = data_dir / "processed"
 
@@ -207,6 +266,10 @@ def interactive():
     Guides you through the scraping process step by step.
     This is intended for use within Claude Code with MCP.
     """
+    from rich.panel import Panel
+    from .scraper import Nof1Scraper
+
+    console = _console()
     console.print(Panel(
         "[bold cyan]nof1.ai Interactive Scraper[/bold cyan]\n\n"
         "This tool will guide you through scraping chain of thought data.\n\n"
@@ -244,5 +307,11 @@ def interactive():
     )
 
 
+def main(prog: str = "nof1-scraper"):
+    """Console entry point: --version and bare --help skip building Typer"""
+    if not fast_path(app, prog, sys.argv[1:]):
+        app()
+
+
 if __name__ == "__main__":
-    app()
+    main("python -m src.cli")
@@ -6,19 +6,26 @@ Combines Chrome Extension + Playwright data and prepares for OpenMemory
 import typer
 from pathlib import Path
 from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-from rich.progress import Progress
-import json
+from rich.style import Style
+import sys
 from typing import Optional
 
-from .merger import DataMerger
-from .openmemory_exporter import OpenMemoryExporter
+from .cli import fast_path
+
+# The merger, exporter (and with them sqlite3 and the pydantic models) and
+# rich's tables and panels are imported inside the commands that use them,
+# so --help doesn't pay for loading them
 
 app = typer.Typer(help="NOF1.AI Data Integration CLI")
 console = Console()
 
 
+# Table column styles, built once instead of parsed from strings per column
+LABEL_STYLE = Style(color="cyan")
+VALUE_STYLE = Style(color="green")
+PRIORITY_STYLE = Style(color="yellow")
+PERFORMANCE_STYLE = Style(color="magenta")
+
 # Default paths
 DEFAULT_EXTENSION_DB = Path("GPT_Implementation_Proposal/collector/nof1_data.db")
 DEFAULT_PLAYWRIGHT_DIR = Path("data")
@@ -43,6 +50,10 @@ def stats(
     """
     Show statistics about available data from all sources
     """
+    from rich.console import Group
+    from rich.table import Table
+    from .merger import DataMerger
+
     console.print("\n[bold cyan]Data Integration Statistics[/bold cyan]\n")
 
     try:
@@ -50,53 +61,40 @@ def stats(
         stats = merger.get_merge_statistics()
 
         # Extension stats
-        console.print("[bold]Chrome Extension Data:[/bold]")
         ext_table = Table(show_header=False)
-        ext_table.add_column("Metric", style="cyan")
-        ext_table.add_column("Value", style="green")
+        ext_table.add_column("Metric", style=LABEL_STYLE)
+        ext_table.add_column("Value", style=VALUE_STYLE)
         ext_table.add_row("Total Messages", str(stats["extension"]["total_messages"]))
         ext_table.add_row("Database", str(stats["extension"]["database_path"]))
         ext_table.add_row("First Message", stats["extension"]["first_message"] or "N/A")
         ext_table.add_row("Last Message", stats["extension"]["last_message"] or "N/A")
-        console.print(ext_table)
-        console.print()
 
         # By model (extension)
-        console.print("[bold]Extension Messages by Model:[/bold]")
         model_table = Table()
-        model_table.add_column("Model", style="cyan")
-        model_table.add_column("Count", style="green", justify="right")
+        model_table.add_column("Model", style=LABEL_STYLE)
+        model_table.add_column("Count", style=VALUE_STYLE, justify="right")
         for model, count in stats["extension"]["by_model"].items():
             model_table.add_row(model, str(count))
-        console.print(model_table)
-        console.print()
 
         # Playwright stats
-        console.print("[bold]Playwright Scraped Data:[/bold]")
         pw_table = Table(show_header=False)
-        pw_table.add_column("Metric", style="cyan")
-        pw_table.add_column("Value", style="green")
+        pw_table.add_column("Metric", style=LABEL_STYLE)
+        pw_table.add_column("Value", style=VALUE_STYLE)
         pw_table.add_row("Total Messages", str(stats["playwright"]["total_messages"]))
-        console.print(pw_table)
-        console.print()
 
         # Merged stats
-        console.print("[bold]Merged (Deduplicated) Data:[/bold]")
         merged_table = Table(show_header=False)
-        merged_table.add_column("Metric", style="cyan")
-        merged_table.add_column("Value", style="green")
+        merged_table.add_column("Metric", style=LABEL_STYLE)
+        merged_table.add_column("Value", style=VALUE_STYLE)
         merged_table.add_row("Total Unique Messages", str(stats["merged"]["total_unique_messages"]))
         merged_table.add_row("Duplicates Removed", str(stats["merged"]["duplicates_removed"]))
-        console.print(merged_table)
-        console.print()
 
         # Priority models
-        console.print("[bold]Priority Models (by P/L):[/bold]")
         priority_table = Table()
-        priority_table.add_column("Priority", style="yellow")
-        priority_table.add_column("Model", style="cyan")
-        priority_table.add_column("Messages", style="green", justify="right")
-        priority_table.add_column("Performance", style="magenta")
+        priority_table.add_column("Priority", style=PRIORITY_STYLE)
+        priority_table.add_column("Model", style=LABEL_STYLE)
+        priority_table.add_column("Messages", style=VALUE_STYLE, justify="right")
+        priority_table.add_column("Performance", style=PERFORMANCE_STYLE)
 
         priority_models = [
             ("[1]", "deepseek-v3.1", "Highest P/L"),
@@ -108,7 +106,23 @@ def stats(
             count = stats["merged"]["by_model"].get(model_name, 0)
             priority_table.add_row(priority, model_name, str(count), perf)
 
-        console.print(priority_table)
+        # Render every section in a single print
+        console.print(Group(
+            "[bold]Chrome Extension Data:[/bold]",
+            ext_table,
+            "",
+            "[bold]Extension Messages by Model:[/bold]",
+            model_table,
+            "",
+            "[bold]Playwright Scraped Data:[/bold]",
+            pw_table,
+            "",
+            "[bold]Merged (Deduplicated) Data:[/bold]",
+            merged_table,
+            "",
+            "[bold]Priority Models (by P/L):[/bold]",
+            priority_table,
+        ))
 
     except FileNotFoundError as e:
         console.print(f"[bold red]Error:[/bold red] {e}")
@@ -147,6 +161,8 @@ def export_json(
     """
     Export merged data to JSON file
     """
+    from .merger import DataMerger
+
     console.print(f"\n[bold cyan]Exporting merged data to {output}[/bold cyan]\n")
 
     try:
@@ -198,6 +214,11 @@ def prepare_openmemory(
     This command shows you what will be exported and optionally saves samples to a file.
     You (Claude Code) will then use mcp__openmemory__openmemory_store to actually send it.
     """
+    from rich.panel import Panel
+    from rich.table import Table
+    from .merger import DataMerger
+    from .openmemory_exporter import OpenMemoryExporter
+
     console.print("\n[bold cyan]Preparing data for OpenMemory[/bold cyan]\n")
 
     try:
@@ -209,8 +230,8 @@ def prepare_openmemory(
 
         console.print("[bold]Export Statistics:[/bold]")
         stats_table = Table(show_header=False)
-        stats_table.add_column("Metric", style="cyan")
-        stats_table.add_column("Value", style="green")
+        stats_table.add_column("Metric", style=LABEL_STYLE)
+        stats_table.add_column("Value", style=VALUE_STYLE)
         stats_table.add_row("Total Messages", str(stats["total_messages"]))
         stats_table.add_row("Unique Tags", str(stats["unique_tags"]))
         console.print(stats_table)
@@ -218,8 +239,8 @@ def prepare_openmemory(
 
         console.print("[bold]Messages by Model:[/bold]")
         model_table = Table()
-        model_table.add_column("Model", style="cyan")
-        model_table.add_column("Count", style="green", justify="right")
+        model_table.add_column("Model", style=LABEL_STYLE)
+        model_table.add_column("Count", style=VALUE_STYLE, justify="right")
         for model_name, count in stats["by_model"].items():
             model_table.add_row(model_name, str(count))
         console.print(model_table)
@@ -227,8 +248,8 @@ def prepare_openmemory(
 
         console.print("[bold]Top Tags:[/bold]")
         tag_table = Table()
-        tag_table.add_column("Tag", style="cyan")
-        tag_table.add_column("Count", style="green", justify="right")
+        tag_table.add_column("Tag", style=LABEL_STYLE)
+        tag_table.add_column("Count", style=VALUE_STYLE, justify="right")
         for tag, count in list(stats["top_tags"].items())[:15]:
             tag_table.add_row(tag, str(count))
         console.print(tag_table)
@@ -242,7 +263,7 @@ def prepare_openmemory(
             console.print("[yellow]  mcp__openmemory__openmemory_store[/yellow]")
         else:
             console.print("[bold]Sample prepared data:[/bold]")
-            prepared = exporter.prepare_all_for_export(model_filter=model)[:limit]
+            prepared = exporter.prepare_all_for_export(model_filter=model, limit=limit)
             for i, item in enumerate(prepared, 1):
                 console.print(f"\n[bold cyan]Sample {i}:[/bold cyan]")
                 console.print(Panel(
@@ -286,19 +307,20 @@ def export_openmemory_batch(
     Claude Code can then read this file and loop through calling
     mcp__openmemory__openmemory_store for each item.
     """
+    from .merger import DataMerger, write_json_array
+    from .openmemory_exporter import OpenMemoryExporter
+
     console.print("\n[bold cyan]Exporting batch data for OpenMemory[/bold cyan]\n")
 
     try:
         merger = DataMerger(extension_db, playwright_dir)
         exporter = OpenMemoryExporter(merger)
 
-        prepared = exporter.prepare_all_for_export(model_filter=model)
-
+        # Each message is prepared as it is written, not all up front
         output.parent.mkdir(parents=True, exist_ok=True)
-        with open(output, 'w', encoding='utf-8') as f:
-            json.dump(prepared, f, indent=2, ensure_ascii=False)
+        count = write_json_array(exporter.iter_prepared(model_filter=model), output)
 
-        console.print(f"[bold green]Exported {len(prepared)} messages to {output}[/bold green]")
+        console.print(f"[bold green]Exported {count} messages to {output}[/bold green]")
         console.print("\n[yellow]Claude Code: Read this file and call mcp__openmemory__openmemory_store for each item[/yellow]")
 
     except Exception as e:
@@ -306,5 +328,11 @@ def export_openmemory_batch(
         raise typer.Exit(1)
 
 
+def main(prog: str = "python -m src.integration_cli"):
+    """Console entry point: --version and bare --help skip building Typer"""
+    if not fast_path(app, prog, sys.argv[1:]):
+        app()
+
+
 if __name__ == "__main__":
-    app()
+    main()
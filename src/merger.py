@@ -3,18 +3,47 @@ Data merger - combines Chrome Extension and Playwright data sources
 Deduplicates by content hash and timestamp
 """
 
-import hashlib
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Set, Tuple, Optional
-from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from collections import Counter
+from operator import attrgetter
 import json
+import textwrap
 
 from .models import ModelMessage
 from .sqlite_reader import ExtensionDataReader
 from .storage import StorageManager
 
 
+def write_json_array(items: Iterable[Any], output_path: Path) -> int:
+    """
+    Write items to a JSON array file one at a time
+
+    The output matches json.dump(list(items), f, indent=2, ensure_ascii=False),
+    but only one item is held in serialized form at a time.
+
+    Args:
+        items: JSON-serializable items, e.g. a generator
+        output_path: Where to save JSON file
+
+    Returns:
+        Number of items written
+    """
+    count = 0
+
+    with open(output_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+        for item in items:
+            f.write("[\n" if count == 0 else ",\n")
+            # Nest the item's own indented dump one level inside the array
+            f.write(textwrap.indent(json.dumps(item, indent=2, ensure_ascii=False), "  "))
+            count += 1
+
+        f.write("\n]" if count else "[]")
+
+    return count
+
+
 class DataMerger:
     """Merges data from multiple sources with deduplication"""
 
@@ -29,6 +58,30 @@ class DataMerger:
         self.extension_reader = ExtensionDataReader(extension_db_path)
         self.playwright_storage = StorageManager(playwright_data_dir)
 
+        # Request -> (source versions, merged result); see source_versions.
+        # One entry per request, replaced when the sources change
+        self._merge_cache: Dict[tuple, Tuple[tuple, List[ModelMessage]]] = {}
+
+    def source_versions(self) -> tuple:
+        """
+        Modification times of both data sources
+
+        A write to the extension database (in WAL mode, possibly only to its
+        -wal file), a file added to the Playwright raw directory, or any save
+        through this merger's StorageManager changes this, which invalidates
+        cached merges. A raw file rewritten in place by another process or
+        StorageManager leaves the directory mtime alone and is not detected.
+        """
+        db_path = self.extension_reader.db_path
+        wal_path = db_path.with_name(db_path.name + "-wal")
+
+        return (
+            db_path.stat().st_mtime_ns,
+            wal_path.stat().st_mtime_ns if wal_path.exists() else None,
+            self.playwright_storage.raw_dir.stat().st_mtime_ns,
+            self.playwright_storage.save_count,
+        )
+
     def merge_all(self, priority_source: str = "extension") -> List[ModelMessage]:
         """
         Merge all data from both sources
@@ -39,6 +92,12 @@ class DataMerger:
         Returns:
             List of deduplicated ModelMessage objects
         """
+        key = ("all", priority_source)
+        versions = self.source_versions()
+        cached = self._merge_cache.get(key)
+        if cached is not None and cached[0] == versions:
+            return list(cached[1])
+
         print("Reading Chrome extension data...")
         extension_messages = self.extension_reader.read_all_messages()
         print(f"  Found {len(extension_messages)} extension messages")
@@ -55,7 +114,8 @@ class DataMerger:
         )
 
         print(f"  Result: {len(merged)} unique messages")
-        return merged
+        self._merge_cache[key] = (versions, merged)
+        return list(merged)
 
     def merge_by_model(
         self,
@@ -72,33 +132,43 @@ class DataMerger:
         Returns:
             List of deduplicated ModelMessage objects for the specified model
         """
+        key = ("model", model_name, priority_source)
+        versions = self.source_versions()
+        cached = self._merge_cache.get(key)
+        if cached is not None and cached[0] == versions:
+            return list(cached[1])
+
         extension_messages = self.extension_reader.read_all_messages(model_name)
         playwright_messages = [
             msg for msg in self.playwright_storage.load_all_messages()
             if msg.model_name.lower() == model_name.lower()
         ]
 
-        return self._deduplicate_messages(
+        merged = self._deduplicate_messages(
             extension_messages,
             playwright_messages,
             priority_source
         )
 
+        self._merge_cache[key] = (versions, merged)
+        return list(merged)
+
     def get_merge_statistics(self) -> Dict:
         """Get statistics about merged data"""
         extension_stats = self.extension_reader.get_statistics()
 
         # Get Playwright stats
         playwright_messages = self.playwright_storage.load_all_messages()
-        playwright_by_model = defaultdict(int)
-        for msg in playwright_messages:
-            playwright_by_model[msg.model_name] += 1
+        playwright_by_model = Counter(map(attrgetter("model_name"), playwright_messages))
 
-        # Perform merge to get deduplicated count
-        merged = self.merge_all()
-        merged_by_model = defaultdict(int)
-        for msg in merged:
-            merged_by_model[msg.model_name] += 1
+        # Merge the already-loaded Playwright messages to get the
+        # deduplicated count, rather than having merge_all load them again
+        merged = self._deduplicate_messages(
+            self.extension_reader.read_all_messages(),
+            playwright_messages,
+            "extension"
+        )
+        merged_by_model = Counter(map(attrgetter("model_name"), merged))
 
         return {
             "extension": extension_stats,
@@ -131,6 +201,12 @@ class DataMerger:
         2. If duplicate found, keep the one from priority_source
         3. Return sorted by timestamp (newest first)
 
+        Duplicates within a single source are collapsed too (Playwright
+        rescrapes save the same message under new files), so even when one
+        source is empty the other still goes through the full pass. Each
+        message is hashed once per pass; repeat merges over unchanged sources
+        are served from _merge_cache instead.
+
         Args:
             extension_messages: Messages from Chrome extension
             playwright_messages: Messages from Playwright scraper
@@ -139,45 +215,31 @@ class DataMerger:
         Returns:
             Deduplicated list of messages
         """
-        seen_keys: Set[str] = set()
-        unique_messages: Dict[str, Tuple[ModelMessage, str]] = {}
+        unique_messages: Dict[tuple, ModelMessage] = {}
 
-        # Process both sources
-        sources = []
+        # Process both sources, priority source first
         if priority_source == "extension":
-            sources = [
-                (extension_messages, "extension"),
-                (playwright_messages, "playwright")
-            ]
+            priority_messages, other_messages = extension_messages, playwright_messages
         else:
-            sources = [
-                (playwright_messages, "playwright"),
-                (extension_messages, "extension")
-            ]
-
-        for messages, source_name in sources:
-            for msg in messages:
-                # Create deduplication key
-                key = self._create_dedup_key(msg)
-
-                if key not in seen_keys:
-                    # New message
-                    seen_keys.add(key)
-                    unique_messages[key] = (msg, source_name)
-                else:
-                    # Duplicate found - keep the one from priority source
-                    existing_msg, existing_source = unique_messages[key]
-                    if source_name == priority_source:
-                        # Replace with priority source
-                        unique_messages[key] = (msg, source_name)
-
-        # Extract messages and sort by timestamp (newest first)
-        result = [msg for msg, _ in unique_messages.values()]
-        result.sort(key=lambda m: m.timestamp, reverse=True)
+            priority_messages, other_messages = playwright_messages, extension_messages
+
+        # Within the priority source a later duplicate replaces an earlier
+        # one; the other source only fills keys the priority source lacks
+        for msg in priority_messages:
+            unique_messages[self._create_dedup_key(msg)] = msg
+
+        for msg in other_messages:
+            unique_messages.setdefault(self._create_dedup_key(msg), msg)
+
+        # Extract messages and sort by timestamp (newest first). Each source
+        # arrives mostly time-ordered (the reader queries newest first,
+        # storage loads oldest first), so the values form a few long runs
+        # that timsort merges in close to linear time
+        result = sorted(unique_messages.values(), key=attrgetter("timestamp"), reverse=True)
 
         return result
 
-    def _create_dedup_key(self, msg: ModelMessage) -> str:
+    def _create_dedup_key(self, msg: ModelMessage) -> tuple:
         """
         Create deduplication key for a message
 
@@ -187,19 +249,14 @@ class DataMerger:
             msg: ModelMessage to create key for
 
         Returns:
-            Deduplication key string
+            Deduplication key tuple
         """
-        # Hash the chain of thought content
-        content_hash = hashlib.sha256(
-            msg.chain_of_thought.encode('utf-8')
-        ).hexdigest()[:16]
-
         # Round timestamp to nearest minute (handles slight timing differences)
         timestamp_rounded = msg.timestamp.replace(second=0, microsecond=0)
 
-        # Create composite key
-        key = f"{msg.model_name}:{content_hash}:{timestamp_rounded.isoformat()}"
-        return key
+        # Create composite key; the fixed-size digest keeps keys small and
+        # cheap to compare however long the chain of thought is
+        return (msg.model_name, msg.content_hash, timestamp_rounded)
 
     def export_merged_to_json(
         self,
@@ -221,10 +278,9 @@ class DataMerger:
         output_path = Path(output_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Convert to JSON-serializable format
-        data = [json.loads(msg.model_dump_json()) for msg in merged]
-
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        # Convert to JSON-serializable format as each message is written
+        count = write_json_array(
+            (msg.model_dump(mode="json") for msg in merged), output_path
+        )
 
-        print(f"Exported {len(data)} messages to {output_path}")
+        print(f"Exported {count} messages to {output_path}")
@@ -1,5 +1,6 @@
 """Data models for nof1.ai scraper"""
 
+import hashlib
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 from pydantic import BaseModel, Field
@@ -42,6 +43,18 @@ class ModelMessage(BaseModel):
             datetime: lambda v: v.isoformat()
         }
 
+    @property
+    def content_hash(self) -> bytes:
+        """
+        64-bit BLAKE2b digest of the chain of thought
+
+        Computed on each access rather than cached, so assignment or
+        model_copy(update=...) can never leave a stale digest behind.
+        """
+        return hashlib.blake2b(
+            self.chain_of_thought.encode("utf-8"), digest_size=8
+        ).digest()
+
     def to_openmemory_content(self) -> str:
         """Format for OpenMemory storage"""
         return f"""
@@ -58,16 +71,10 @@ DECISIONS:
 
     def _format_decisions(self) -> str:
         """Format trading decisions for text output"""
-        if not self.trading_decisions:
-            return "No trades"
-
-        lines = []
-        for decision in self.trading_decisions:
-            lines.append(
-                f"- {decision.symbol}: {decision.action} "
-                f"({decision.confidence:.0%} confidence)"
-            )
-        return "\n".join(lines)
+        return "\n".join(
+            f"- {decision.symbol}: {decision.action} ({decision.confidence:.0%} confidence)"
+            for decision in self.trading_decisions
+        ) or "No trades"
 
     def to_metadata(self) -> Dict[str, Any]:
         """Generate metadata for OpenMemory"""
@@ -5,12 +5,54 @@ This module provides instructions and data structures for navigating nof1.ai
 when running through Claude Code with MCP Playwright integration.
 """
 
+import json
+import re
+from collections import OrderedDict
 from typing import List, Optional, Dict, Any
 from dataclasses import dataclass
 from rich.console import Console
 
 console = Console()
 
+# Patterns are compiled once at import rather than on every snapshot
+
+# Message blocks: model image, its ref, then the message timestamp. The
+# timestamp sits a few lines below the image, so the gap must cross newlines;
+# bounding it (and the name) caps backtracking on large snapshots
+MESSAGE_RE = re.compile(
+    r'img "([^"]{1,120})" \[ref=(e\d+)\].{0,4096}?(\d{1,2}/\d{1,2} \d{2}:\d{2}:\d{2})',
+    re.DOTALL,
+)
+
+# Sections of an expanded message: (key, label, marker ending the section).
+# Located with str.find, so extraction is linear with no backtracking
+EXPANDED_SECTIONS = (
+    ("user_prompt", "USER_PROMPT", "CHAIN_OF_THOUGHT"),
+    ("chain_of_thought", "CHAIN_OF_THOUGHT", "TRADING_DECISIONS"),
+    ("trading_decisions", "TRADING_DECISIONS", "generic [ref="),
+)
+
+# Sections of one container's innerText from the bulk_extract step. The
+# "generic [ref=" snapshot token never occurs there; each text holds exactly
+# one message, so the last section ends where the container does (None)
+BULK_SECTIONS = EXPANDED_SECTIONS[:2] + (
+    ("trading_decisions", "TRADING_DECISIONS", None),
+)
+
+# Expands every message container in the page and returns their texts, so a
+# single browser_evaluate call replaces one click + snapshot per message.
+# Containers already showing their sections are left alone, since clicking
+# would collapse them. Filled in with (container selector, max messages,
+# expansion wait in ms)
+BULK_EXTRACT_JS = """async () => {
+    const containers = Array.from(document.querySelectorAll(%s)).slice(0, %d);
+    for (const container of containers) {
+        if (!container.innerText.includes("CHAIN_OF_THOUGHT")) container.click();
+    }
+    await new Promise(resolve => setTimeout(resolve, %d));
+    return containers.map(container => container.innerText);
+}"""
+
 
 @dataclass
 class NavigationConfig:
@@ -19,6 +61,19 @@ class NavigationConfig:
     max_messages: int = 50
     filter_model: Optional[str] = None
     scroll_wait_ms: int = 2000
+    expand_wait_ms: int = 1000
+
+
+@dataclass(frozen=True, slots=True)
+class MessageRef:
+    """A message found in the chat list, with the ref needed to click it"""
+    model_name: str
+    timestamp: str
+    ref: str
+
+    @property
+    def element_locator(self) -> str:
+        return f"[ref={self.ref}]"
 
 
 class Nof1Navigator:
@@ -29,9 +84,16 @@ class Nof1Navigator:
     automation happens through MCP Playwright tools when running in Claude Code.
     """
 
+    # Parsed message lists kept for the most recent snapshots
+    SNAPSHOT_CACHE_SIZE = 16
+
     def __init__(self, config: NavigationConfig):
         self.config = config
 
+        # Snapshot text -> parsed message list, least recently used first.
+        # Keyed on the text itself so a hash collision can never alias
+        self._snapshot_cache: OrderedDict[str, List[MessageRef]] = OrderedDict()
+
     def get_navigation_steps(self) -> List[str]:
         """
         Get step-by-step navigation instructions for Claude Code
@@ -84,7 +146,7 @@ class Nof1Navigator:
             "trading_decisions_section": "button:has-text('TRADING_DECISIONS')",
         }
 
-    def extract_message_list_from_snapshot(self, snapshot: str) -> List[Dict[str, Any]]:
+    def extract_message_list_from_snapshot(self, snapshot: str) -> List[MessageRef]:
         """
         Extract list of messages from page snapshot
 
@@ -94,32 +156,41 @@ class Nof1Navigator:
         Returns:
             List of message metadata (model name, timestamp, ref)
         """
+        # Re-reading an unchanged page returns the same snapshot text
+        cached = self._snapshot_cache.get(snapshot)
+        if cached is not None:
+            self._snapshot_cache.move_to_end(snapshot)
+            console.print(f"[dim]Extracted {len(cached)} messages from snapshot[/dim]")
+            return list(cached)
+
         messages = []
 
         # Parse the snapshot to find message elements
         # This is a simplified version - actual parsing would be more robust
-        import re
 
         # Look for patterns like:
         # - img "Claude Sonnet 4.5" [ref=eXXX]
         # - generic [ref=eXXX]: CLAUDE SONNET 4.5
         # - generic [ref=eXXX]: 10/29 07:57:57
 
-        # Extract message blocks
-        message_pattern = r'img "([^"]+)" \[ref=(e\d+)\].*?(\d{1,2}/\d{1,2} \d{2}:\d{2}:\d{2})'
+        # Extract message blocks; a snapshot with no images cannot match, and
+        # the substring test is far cheaper than a regex walk over the body
+        if 'img "' not in snapshot:
+            console.print("[dim]Extracted 0 messages from snapshot[/dim]")
+            return messages
 
-        for match in re.finditer(message_pattern, snapshot, re.DOTALL):
-            model_name, ref, timestamp = match.groups()
-
-            messages.append({
-                "model_name": model_name,
-                "timestamp": timestamp,
-                "ref": ref,
-                "element_locator": f"[ref={ref}]",
-            })
+        messages = [
+            MessageRef(model_name, timestamp, ref)
+            for model_name, ref, timestamp in MESSAGE_RE.findall(snapshot)
+        ]
 
         console.print(f"[dim]Extracted {len(messages)} messages from snapshot[/dim]")
-        return messages
+
+        self._snapshot_cache[snapshot] = messages
+        if len(self._snapshot_cache) > self.SNAPSHOT_CACHE_SIZE:
+            self._snapshot_cache.popitem(last=False)
+
+        return list(messages)
 
     def get_mcp_navigation_plan(self) -> Dict[str, Any]:
         """
@@ -151,11 +222,25 @@ class Nof1Navigator:
                     "tool": "mcp__playwright__browser_snapshot",
                     "params": {},
                 },
+                {
+                    # One round-trip for all messages; parse the returned
+                    # array with MessageExpander.extract_bulk_messages
+                    "action": "bulk_extract",
+                    "tool": "mcp__playwright__browser_evaluate",
+                    "params": {
+                        "function": BULK_EXTRACT_JS % (
+                            json.dumps(self.get_selector_patterns()["message_container"]),
+                            self.config.max_messages,
+                            self.config.expand_wait_ms,
+                        ),
+                    },
+                },
             ],
             "config": {
                 "max_messages": self.config.max_messages,
                 "filter_model": self.config.filter_model,
                 "scroll_wait_ms": self.config.scroll_wait_ms,
+                "expand_wait_ms": self.config.expand_wait_ms,
             },
         }
 
@@ -184,41 +269,65 @@ class MessageExpander:
         }
 
     @staticmethod
-    def extract_expanded_message(snapshot: str) -> Dict[str, Any]:
+    def extract_expanded_message(
+        snapshot: str,
+        section_markers: tuple = EXPANDED_SECTIONS,
+    ) -> Dict[str, Any]:
         """
         Extract data from an expanded message snapshot
 
         Args:
             snapshot: YAML snapshot of the expanded message
+            section_markers: (key, label, end marker) triples; an end marker
+                of None means the section runs to the end of the text
 
         Returns:
             Dictionary with extracted sections
         """
         # Parse the snapshot to extract the three main sections
-        import re
-
         sections = {}
 
-        # Extract USER_PROMPT section
-        user_prompt_pattern = r"USER_PROMPT.*?(?=CHAIN_OF_THOUGHT|$)"
-        user_match = re.search(user_prompt_pattern, snapshot, re.DOTALL)
-        if user_match:
-            sections["user_prompt"] = user_match.group(0)
+        # A section without its end marker runs to the end of the snapshot,
+        # less one trailing newline (matching the old `.*?(?=...|$)` regexes)
+        text_end = len(snapshot) - snapshot.endswith("\n")
 
-        # Extract CHAIN_OF_THOUGHT section
-        cot_pattern = r"CHAIN_OF_THOUGHT.*?(?=TRADING_DECISIONS|$)"
-        cot_match = re.search(cot_pattern, snapshot, re.DOTALL)
-        if cot_match:
-            sections["chain_of_thought"] = cot_match.group(0)
+        # Each label is located once. A section's end marker is usually the
+        # next section's label, so that position is reused when it falls
+        # after the section start; only other markers need their own scan
+        label_positions = {
+            label: snapshot.find(label) for _, label, _ in section_markers
+        }
 
-        # Extract TRADING_DECISIONS section
-        decisions_pattern = r"TRADING_DECISIONS.*?(?=generic \[ref=|$)"
-        decisions_match = re.search(decisions_pattern, snapshot, re.DOTALL)
-        if decisions_match:
-            sections["trading_decisions"] = decisions_match.group(0)
+        for key, label, end_marker in section_markers:
+            start = label_positions[label]
+            if start == -1:
+                continue
+            body_start = start + len(label)
+            end = label_positions.get(end_marker)
+            if end_marker is None:
+                end = -1
+            elif end is None or -1 < end < body_start:
+                end = snapshot.find(end_marker, body_start)
+            sections[key] = snapshot[start:end if end != -1 else text_end]
 
         return sections
 
+    @staticmethod
+    def extract_bulk_messages(texts: List[str]) -> List[Dict[str, Any]]:
+        """
+        Extract data from the result of the bulk_extract plan step
+
+        Args:
+            texts: Expanded message texts returned by browser_evaluate
+
+        Returns:
+            List of dictionaries with extracted sections, one per message
+        """
+        return [
+            MessageExpander.extract_expanded_message(text, BULK_SECTIONS)
+            for text in texts
+        ]
+
 
 # Usage instructions for Claude Code environment:
 """
@@ -240,6 +349,9 @@ When running this scraper in Claude Code with MCP, the workflow is:
      * Take snapshot
      * Extract data using ChainExtractor
      * Store using StorageManager
+   - Or expand them all at once: run the bulk_extract step's script with
+     mcp__playwright__browser_evaluate and parse the returned texts with
+     MessageExpander.extract_bulk_messages
 
 4. The scraper module (scraper.py) will orchestrate this flow
 """
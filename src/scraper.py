@@ -8,6 +8,7 @@ This module coordinates the scraping process:
 4. Store in local files and OpenMemory
 """
 
+from collections import defaultdict
 from datetime import datetime
 from pathlib import Path
 from typing import List, Optional
@@ -180,26 +181,29 @@ class Nof1Scraper:
 
         console.print("\n[bold cyan]Scrape Summary[/bold cyan]\n")
 
-        # Create summary table
+        # Create summary table. Built fresh each call: Table has no copy(),
+        # and deep-copying a cached one is slower than these few lines
         table = Table(title="Messages by Model")
         table.add_column("Model", style="cyan")
         table.add_column("Count", justify="right", style="green")
         table.add_column("Avg Return", justify="right", style="yellow")
 
-        # Group by model
-        by_model = {}
+        # Aggregate per model in one pass: [count, return count, return sum]
+        by_model = defaultdict(lambda: [0, 0, 0.0])
         for msg in messages:
-            if msg.model_name not in by_model:
-                by_model[msg.model_name] = []
-            by_model[msg.model_name].append(msg)
-
-        for model_name in sorted(by_model.keys()):
-            model_messages = by_model[model_name]
-            count = len(model_messages)
-
-            # Calculate average return
-            returns = [m.total_return for m in model_messages if m.total_return]
-            avg_return = sum(returns) / len(returns) if returns else 0
+            entry = by_model[msg.model_name]
+            entry[0] += 1
+            if msg.total_return is not None:
+                entry[1] += 1
+                entry[2] += msg.total_return
+
+        # Every model gets a row and there are only a handful of them, so a
+        # full sort is right here; there is no top-K to select with heapq
+        for model_name in sorted(by_model):
+            count, return_count, return_sum = by_model[model_name]
+
+            # Average over messages that reported a return (0.0 included)
+            avg_return = return_sum / return_count if return_count else 0
 
             table.add_row(
                 model_name,
@@ -20,6 +20,13 @@ class StorageManager:
         self.processed_dir = data_dir / "processed"
         self.use_openmemory = use_openmemory
 
+        # load_all_messages result and the raw_dir mtime it was read at
+        self._all_messages = None
+
+        # Incremented on every save, so caches built on top of this storage
+        # can see in-place rewrites that leave the raw_dir mtime unchanged
+        self.save_count = 0
+
         # Ensure directories exist
         self.raw_dir.mkdir(parents=True, exist_ok=True)
         self.processed_dir.mkdir(parents=True, exist_ok=True)
@@ -56,6 +63,10 @@ class StorageManager:
 
         filepath = self.raw_dir / filename
 
+        # Overwriting an existing file leaves the directory mtime unchanged
+        self._all_messages = None
+        self.save_count += 1
+
         # Save with pretty formatting
         with open(filepath, "w", encoding="utf-8") as f:
             json.dump(
@@ -125,21 +136,21 @@ class StorageManager:
         # Iterate through JSON files
         for filepath in self.raw_dir.glob("*.json"):
             try:
-                with open(filepath, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    message = ModelMessage(**data)
+                # Validate straight from the file's bytes with the model's
+                # compiled JSON validator, without an intermediate dict
+                message = ModelMessage.model_validate_json(filepath.read_bytes())
 
-                    # Apply filters
-                    if model_name and message.model_name != model_name:
-                        continue
+                # Apply filters
+                if model_name and message.model_name != model_name:
+                    continue
 
-                    if start_date and message.timestamp < start_date:
-                        continue
+                if start_date and message.timestamp < start_date:
+                    continue
 
-                    if end_date and message.timestamp > end_date:
-                        continue
+                if end_date and message.timestamp > end_date:
+                    continue
 
-                    messages.append(message)
+                messages.append(message)
 
             except Exception as e:
                 console.print(f"[yellow]Error loading {filepath.name}: {e}[/yellow]")
@@ -150,17 +161,25 @@ class StorageManager:
         """
         Load all messages from local storage (convenience method)
 
+        The result is cached until raw_dir changes, so repeated calls in one
+        process don't re-read every file.
+
         Returns:
             List of all ModelMessage objects
         """
-        return self.load_messages()
+        mtime = self.raw_dir.stat().st_mtime_ns
+
+        if self._all_messages is None or self._all_messages[0] != mtime:
+            self._all_messages = (mtime, self.load_messages())
+
+        return list(self._all_messages[1])
 
     def get_storage_stats(self) -> dict:
         """Get statistics about stored messages"""
         json_files = list(self.raw_dir.glob("*.json"))
 
         # Load all messages for stats
-        messages = self.load_messages()
+        messages = self.load_all_messages()
 
         models = set(m.model_name for m in messages)
 